@@ -1,26 +1,62 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+from typing import Any, Dict, List
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from app.models.optimization import AgentAdviseRequest, AgentAdviseResponse, OptimizeRequest
 from app.services.agent import EnergyAdvisorAgent
 from app.services.optimizer import LoadOptimizer
-from app.db.memory import MemoryStore
+from app.services.prices import resolve_prices
+from app.db.memory import memory_store
 
 router = APIRouter()
-agent = EnergyAdvisorAgent()
+memory = memory_store
+agent = EnergyAdvisorAgent(memory)
 optimizer = LoadOptimizer()
-memory = MemoryStore()
+
+
+async def _optimize(request: AgentAdviseRequest) -> Dict[str, Any]:
+    prices, _ = await resolve_prices(request.zone_eic, request.date_utc)
+    optimizer.set_price_data(request.zone_eic, request.date_utc, prices)
+    return optimizer.optimize(
+        zone_eic=request.zone_eic,
+        date_str=request.date_utc,
+        kwh_flexible=request.kwh_flexible,
+        max_shift_hours=3,
+        objective="min_cost"
+    )
+
+
+async def _user_prefs(user_id: str) -> List[str]:
+    # Only the LLM prompt uses preferences; the offline advice does not
+    if not agent.llm:
+        return []
+    return await memory.get_user_preferences(user_id)
+
+
+async def _persist(request: AgentAdviseRequest, savings_eur: float):
+    """Save context and the run for learning; runs after the response is sent"""
+    # The client already has its answer: a failed write is logged, not raised
+    try:
+        if request.context:
+            await memory.save_preference(request.user_id, request.context)
+
+        await memory.save_optimization_run(request.user_id, {
+            'zone_eic': request.zone_eic,
+            'date_utc': request.date_utc,
+            'kwh_flexible': request.kwh_flexible,
+            'savings_eur': savings_eur
+        })
+    except Exception as e:
+        print(f"error: saving advise run for {request.user_id}: {e}")
 
 
 @router.post("/agent/advise", response_model=AgentAdviseResponse)
-async def get_agent_advice(request: AgentAdviseRequest):
+async def get_agent_advice(request: AgentAdviseRequest, background_tasks: BackgroundTasks):
     """Get AI agent advice for load optimization"""
     try:
-        # Run optimization first
-        opt_result = optimizer.optimize(
-            zone_eic=request.zone_eic,
-            date_str=request.date_utc,
-            kwh_flexible=request.kwh_flexible,
-            max_shift_hours=3,
-            objective="min_cost"
+        # Optimization and the preference lookup are independent: run them together
+        opt_result, user_prefs = await asyncio.gather(
+            _optimize(request),
+            _user_prefs(request.user_id)
         )
 
         # Get agent advice
@@ -29,19 +65,12 @@ async def get_agent_advice(request: AgentAdviseRequest):
             optimization_result=opt_result,
             context=request.context,
             zone_eic=request.zone_eic,
-            date_str=request.date_utc
+            date_str=request.date_utc,
+            user_prefs=user_prefs
         )
 
-        # Save to memory for learning
-        if request.context:
-            await memory.save_preference(request.user_id, request.context)
-
-        await memory.save_optimization_run(request.user_id, {
-            'zone_eic': request.zone_eic,
-            'date_utc': request.date_utc,
-            'kwh_flexible': request.kwh_flexible,
-            'savings_eur': opt_result['savings_eur']
-        })
+        # Save to memory for learning, without holding the response
+        background_tasks.add_task(_persist, request, opt_result['savings_eur'])
 
         return AgentAdviseResponse(**advice)
 
@@ -53,6 +82,7 @@ async def get_agent_advice(request: AgentAdviseRequest):
 async def save_user_preferences(user_id: str, preferences: dict):
     """Save user preferences"""
     try:
+        # Saved inline: the cached preferences are invalidated before we reply
         for key, value in preferences.items():
             await memory.save_preference(
                 user_id=user_id,
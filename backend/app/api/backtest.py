@@ -0,0 +1,51 @@
+import asyncio
+import time
+from datetime import datetime
+from fastapi import APIRouter, HTTPException
+from app.models.backtest import BacktestRequest, BacktestResponse
+from app.services.backtest import date_range, run_backtest
+from app.services.entsoe_client import synthetic_market
+from app.db.storage import storage
+
+router = APIRouter()
+
+
+@router.post("/backtest/load-shift", response_model=BacktestResponse)
+async def backtest_load_shift(request: BacktestRequest):
+    """Backtest load-shift strategies over a zone's price history"""
+    try:
+        started = time.perf_counter()
+        dates = date_range(request.start_date, request.end_date)
+
+        if request.source == "synthetic":
+            prices = synthetic_market.prices(
+                request.zone_eic,
+                datetime.strptime(request.start_date, "%Y-%m-%d"),
+                len(dates)
+            ) / 1000
+            kept = dates
+        else:
+            kept, prices = storage.get_price_matrix(request.zone_eic, dates)
+
+        # Vectorized, but still CPU-bound for long ranges: keep it off the event loop
+        results = await asyncio.to_thread(
+            run_backtest,
+            kept,
+            prices,
+            [s.model_dump() for s in request.strategies],
+            request.workers
+        )
+
+        return BacktestResponse(
+            zone_eic=request.zone_eic,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            days=len(kept),
+            skipped_days=len(dates) - len(kept),
+            slots_per_day=prices.shape[1],
+            results=results,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2)
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,23 @@
+from datetime import datetime
+from fastapi import APIRouter, HTTPException
+from app.models.forecast import PriceForecastResponse
+from app.services.forecaster import forecaster
+
+router = APIRouter()
+
+
+@router.get("/forecast/prices", response_model=PriceForecastResponse)
+async def get_price_forecast(zone_eic: str, date_utc: str):
+    """Provisional day-ahead prices for a date that has not been published yet"""
+    try:
+        datetime.strptime(date_utc, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"date_utc must be YYYY-MM-DD, got {date_utc!r}")
+
+    try:
+        forecast = forecaster.forecast(zone_eic, date_utc)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not forecast:
+        raise HTTPException(status_code=404, detail=f"Not enough price history for {zone_eic} before {date_utc}")
+    return forecast
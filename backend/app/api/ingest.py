@@ -18,6 +18,7 @@ async def ingest_entsoe_data(request: EntsoeIngestRequest):
             "hours": 0,
             "has_prices": False,
             "has_load": False,
+            "has_generation": False,
             "data": {}
         }
 
@@ -45,6 +46,17 @@ async def ingest_entsoe_data(request: EntsoeIngestRequest):
                 response_data["has_load"] = True
                 response_data["data"]["loads"] = loads
 
+        # Fetch generation per production type (basis for the carbon objective)
+        if "generation_per_type" in request.fetch:
+            generation = await entsoe_client.fetch_generation_per_type(
+                request.zone_eic,
+                request.date_utc
+            )
+            if generation:
+                storage.save_generation(request.zone_eic, request.date_utc, generation)
+                response_data["has_generation"] = True
+                response_data["data"]["generation"] = generation
+
         return response_data
 
     except Exception as e:
@@ -1,30 +1,43 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+import numpy as np
 from fastapi import APIRouter, HTTPException
-from app.models.optimization import OptimizeRequest, OptimizeResponse
+from app.models.optimization import (
+    MultiZoneRequest,
+    MultiZoneResponse,
+    OptimizeRequest,
+    OptimizeResponse,
+    StorageBatchRequest,
+    StorageBatchResponse,
+    StorageOptimizeRequest,
+    StorageOptimizeResponse,
+)
 from app.services.optimizer import LoadOptimizer
+from app.services.battery_optimizer import BatteryOptimizer
+from app.services.multizone import compare_zones, stack_curves
+from app.services.objectives import objective_weights
+from app.services.prices import ensure_signals, resolve_prices
+from app.utils.timeseries import slots_for_hours
 from app.db.storage import storage
 
 router = APIRouter()
 optimizer = LoadOptimizer()
+battery_optimizer = BatteryOptimizer()
+
+# Upper bound on simultaneous ENTSO-E lookups from one multi-zone request
+MAX_CONCURRENT_FETCHES = 8
 
 
 @router.post("/optimize/load-shift", response_model=OptimizeResponse)
 async def optimize_load_shift(request: OptimizeRequest):
     """Optimize load shifting based on prices"""
     try:
-        # Check if we have price data
-        prices = storage.get_prices(request.zone_eic, request.date_utc)
-        if not prices:
-            # Try to fetch if not available
-            from app.services.entsoe_client import EntsoeClient
-            client = EntsoeClient()
-            prices = await client.fetch_day_ahead_prices(request.zone_eic, request.date_utc)
-            if prices:
-                storage.save_prices(request.zone_eic, request.date_utc, prices)
-                optimizer.set_price_data(request.zone_eic, request.date_utc, prices)
-            else:
-                raise ValueError("No price data available")
-        else:
-            optimizer.set_price_data(request.zone_eic, request.date_utc, prices)
+        weights = objective_weights(request.objective, request.weights)
+        prices, is_forecast = await resolve_prices(request.zone_eic, request.date_utc)
+        await ensure_signals(request.zone_eic, request.date_utc, weights)
+        optimizer.set_price_data(request.zone_eic, request.date_utc, prices)
 
         # Run optimization
         result = optimizer.optimize(
@@ -32,18 +45,146 @@ async def optimize_load_shift(request: OptimizeRequest):
             date_str=request.date_utc,
             kwh_flexible=request.kwh_flexible,
             max_shift_hours=request.max_shift_hours,
-            objective=request.objective
+            objective=request.objective,
+            weights=request.weights
         )
 
+        result['is_forecast'] = is_forecast
+
         # Save run
         storage.save_run({
             'zone_eic': request.zone_eic,
             'date_utc': request.date_utc,
             'kwh_flexible': request.kwh_flexible,
-            'savings_eur': result['savings_eur']
+            'savings_eur': result['savings_eur'],
+            'is_forecast': is_forecast
         })
 
         return OptimizeResponse(**result)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/optimize/storage", response_model=StorageOptimizeResponse)
+async def optimize_storage(request: StorageOptimizeRequest):
+    """Cost-optimal battery / EV charge and discharge schedule"""
+    try:
+        prices, is_forecast = await resolve_prices(request.zone_eic, request.date_utc)
+
+        result = battery_optimizer.optimize(prices, request.model_dump())
+        result['is_forecast'] = is_forecast
+
+        storage.save_run({
+            'zone_eic': request.zone_eic,
+            'date_utc': request.date_utc,
+            'capacity_kwh': request.capacity_kwh,
+            'savings_eur': result['savings_eur'],
+            'is_forecast': is_forecast
+        })
+
+        return StorageOptimizeResponse(**result)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _solve_storage_batch(request: StorageBatchRequest, curves: Dict) -> List[Dict]:
+    """Group sites by slot count and solve each group in a single DP pass"""
+    groups: Dict[int, List[int]] = {}
+    for i, site in enumerate(request.sites):
+        groups.setdefault(len(curves[(site.zone_eic, site.date_utc)][0]), []).append(i)
+
+    solver = BatteryOptimizer(soc_levels=request.soc_levels)
+    results: List[Dict] = [None] * len(request.sites)
+    for indices in groups.values():
+        sites = [request.sites[i] for i in indices]
+        matrix = np.array([
+            [p['price_eur_kwh'] for p in curves[(s.zone_eic, s.date_utc)][0]] for s in sites
+        ], dtype=np.float64)
+        solved = solver.optimize_batch(matrix, [s.model_dump() for s in sites])
+        baselines = solver.baseline_costs(matrix, solved)
+        for j, (i, site) in enumerate(zip(indices, sites)):
+            prices, is_forecast = curves[(site.zone_eic, site.date_utc)]
+            result = solver.to_result(prices, matrix[j], solved, j, baselines[j], include_curve=False)
+            result['is_forecast'] = is_forecast
+            results[i] = result
+    return results
+
+
+@router.post("/optimize/storage/batch", response_model=StorageBatchResponse)
+async def optimize_storage_batch(request: StorageBatchRequest):
+    """Solve many sites in one vectorized pass (price curves are omitted from results)"""
+    try:
+        started = time.perf_counter()
+        curves = {}
+        for site in request.sites:
+            key = (site.zone_eic, site.date_utc)
+            if key not in curves:
+                curves[key] = await resolve_prices(*key)
+
+        # Seconds of numpy work for large batches: keep it off the event loop
+        results = await asyncio.to_thread(_solve_storage_batch, request, curves)
+
+        return StorageBatchResponse(
+            results=results,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2)
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/optimize/multi-zone", response_model=MultiZoneResponse)
+async def optimize_multi_zone(request: MultiZoneRequest):
+    """Compare several bidding zones and find the cheapest slots across them"""
+    try:
+        start = datetime.strptime(request.date_utc, "%Y-%m-%d")
+        days = [(start + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(request.horizon_days)]
+        zones = list(dict.fromkeys(request.zones))
+
+        # Fetch every missing zone-day concurrently, bounded to stay polite to ENTSO-E
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+        async def resolve(zone_eic: str, date_str: str):
+            async with semaphore:
+                return await resolve_prices(zone_eic, date_str)
+
+        resolved = await asyncio.gather(
+            *(resolve(zone, day) for zone in zones for day in days),
+            return_exceptions=True
+        )
+
+        kept, curves, forecast_flags, missing = [], [], [], {}
+        for z, zone in enumerate(zones):
+            results = resolved[z * len(days):(z + 1) * len(days)]
+            error = next((r for r in results if isinstance(r, Exception)), None)
+            if error is not None:
+                missing[zone] = str(error)
+                continue
+            kept.append(zone)
+            curves.append([prices for prices, _ in results])
+            forecast_flags.append(any(is_forecast for _, is_forecast in results))
+        if not kept:
+            raise ValueError("No price data available for any requested zone")
+
+        matrix, slots_per_day = stack_curves(curves)
+        step = timedelta(days=1) / slots_per_day
+        first = start.replace(tzinfo=timezone.utc)
+        timestamps = [first + step * i for i in range(matrix.shape[1])]
+        shift_slots = slots_for_hours(request.max_shift_hours, slots_per_day, matrix.shape[1])
+
+        comparison = compare_zones(kept, timestamps, matrix, request.kwh_flexible, shift_slots)
+        for zone_result, is_forecast in zip(comparison['zones'], forecast_flags):
+            zone_result['is_forecast'] = is_forecast
+
+        return MultiZoneResponse(
+            date_utc=request.date_utc,
+            horizon_days=request.horizon_days,
+            slots_per_day=slots_per_day,
+            missing_zones=missing,
+            **comparison
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,42 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from app.services.push import broadcaster
+
+router = APIRouter()
+
+
+@router.get("/subscribe/schedules")
+async def subscribe_schedules(
+        zone_eic: str = "10YNL----------L",
+        kwh_flexible: float = Query(gt=0, description="Flexible load in kWh"),
+        max_shift_hours: int = Query(ge=1, le=24, default=3),
+        date_utc: Optional[str] = Query(default=None, description="Only push this date (default: every new curve)")
+):
+    """Server-sent events: a fresh load-shift schedule whenever new prices are stored for the zone"""
+    # Take the slot before any headers go out, so an over-limit client gets a real 503
+    try:
+        sub = broadcaster.subscribe(zone_eic, kwh_flexible, max_shift_hours, date_utc)
+    except OverflowError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(
+        broadcaster.stream(sub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also frees the slot if the client leaves before the stream is first read
+        background=BackgroundTask(broadcaster.unsubscribe, sub)
+    )
+
+
+@router.get("/subscribe/stats")
+async def subscription_stats():
+    """Open subscriptions on this worker"""
+    return {
+        "subscribers": broadcaster.count,
+        "max_subscribers": broadcaster.max_subscribers,
+        "zones": {zone: len(subs) for zone, subs in broadcaster.zones.items()}
+    }
@@ -31,6 +31,15 @@ class Settings(BaseSettings):
         default="https://web-api.tp.entsoe.eu/api", env="ENTSOE_BASE_URL"
     )
     use_mock_data: bool = Field(default=False, env="USE_MOCK_DATA")
+    entsoe_max_retries: int = Field(default=3, env="ENTSOE_MAX_RETRIES")
+    entsoe_backoff_seconds: float = Field(default=0.5, env="ENTSOE_BACKOFF_SECONDS")
+
+    # === Schedule push (SSE) ===
+    push_max_subscribers: int = Field(default=10000, env="PUSH_MAX_SUBSCRIBERS")
+    push_heartbeat_seconds: float = Field(default=15.0, env="PUSH_HEARTBEAT_SECONDS")
+
+    # === Agent ===
+    prefs_cache_size: int = Field(default=1024, env="PREFS_CACHE_SIZE")
 
     # CORS origins: can be a JSON list or a comma-separated string
     cors_origins: List[str] = Field(
@@ -41,6 +50,8 @@ class Settings(BaseSettings):
     # === Mock data controls (added to avoid extra_forbidden) ===
     mock_source: Optional[str] = Field(default=None, env="MOCK_SOURCE")
     mock_data_dir: Optional[str] = Field(default=None, env="MOCK_DATA_DIR")
+    mock_seed: int = Field(default=42, env="MOCK_SEED")
+    mock_resolution_minutes: int = Field(default=60, env="MOCK_RESOLUTION_MINUTES")
 
     @field_validator("cors_origins", mode="before")
     @classmethod
@@ -1,27 +1,70 @@
+import asyncio
 import chromadb
 from chromadb.config import Settings
+from collections import OrderedDict
 from typing import List, Dict, Optional
 import json
 import uuid
+from app.config import settings
 
 
 class MemoryStore:
-    def __init__(self, path: str = "./chroma_db"):
+    def __init__(self, path: str = "./chroma_db", cache_size: int = 1024, embedding_function=None):
         # New-style persistent client; turn off telemetry if you want
         self.client = chromadb.PersistentClient(
             path=path,
             settings=Settings(anonymized_telemetry=False)
         )
 
-        # Create or fetch the collection
-        self.collection = self.client.get_or_create_collection(name="user_preferences")
+        # Create or fetch the collection (None keeps Chroma's default embedder)
+        if embedding_function is None:
+            self.collection = self.client.get_or_create_collection(name="user_preferences")
+        else:
+            self.collection = self.client.get_or_create_collection(
+                name="user_preferences",
+                embedding_function=embedding_function
+            )
+
+        # Per-user preference cache (LRU over users, then by `limit`). A save
+        # drops the user's entry. Users with a read in flight also get a
+        # version, bumped by each save, so a read that started before the
+        # save cannot put stale data back; both maps only hold users that
+        # are cached or being read, so memory stays bounded.
+        self.cache_size = cache_size
+        self._prefs_cache: "OrderedDict[str, Dict[int, List[str]]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._reading: Dict[str, int] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ---------- preference cache ----------
+    def invalidate(self, user_id: str):
+        self._prefs_cache.pop(user_id, None)
+        if user_id in self._reading:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def _cache_get(self, user_id: str, limit: int) -> Optional[List[str]]:
+        entry = self._prefs_cache.get(user_id)
+        if entry is None or limit not in entry:
+            return None
+        self._prefs_cache.move_to_end(user_id)
+        return entry[limit]
 
+    def _cache_put(self, user_id: str, limit: int, prefs: List[str]):
+        self._prefs_cache.setdefault(user_id, {})[limit] = prefs
+        self._prefs_cache.move_to_end(user_id)
+        while len(self._prefs_cache) > self.cache_size:
+            self._prefs_cache.popitem(last=False)
+
+    # ---------- store ----------
     async def save_preference(self, user_id: str, preference: str, metadata: Optional[Dict] = None) -> str:
         """Save user preference to vector store"""
         meta = metadata or {}
         doc_id = str(uuid.uuid4())
 
-        self.collection.add(
+        # Chroma is synchronous (embedding + SQLite); keep it off the event loop
+        await asyncio.to_thread(
+            self.collection.add,
             documents=[preference],
             metadatas=[{
                 "user_id": user_id,
@@ -30,28 +73,49 @@ class MemoryStore:
             }],
             ids=[doc_id],
         )
+        self.invalidate(user_id)
         return doc_id
 
     async def get_user_preferences(self, user_id: str, limit: int = 5) -> List[str]:
-        """Retrieve user preferences"""
+        """Retrieve user preferences (cached per user until the next save)"""
+        cached = self._cache_get(user_id, limit)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        self.cache_misses += 1
+
+        version = self._versions.get(user_id, 0)
+        self._reading[user_id] = self._reading.get(user_id, 0) + 1
         try:
-            res = self.collection.get(
-                where={"user_id": user_id},
+            res = await asyncio.to_thread(
+                self.collection.get,
+                where={"$and": [{"user_id": user_id}, {"type": "preference"}]},
                 limit=limit,
                 include=["documents"],
             )
             docs = res.get("documents") or []
             # `documents` is a list of lists (batched); flatten the first batch if present
-            return docs[0] if docs and isinstance(docs[0], list) else docs
+            prefs = docs[0] if docs and isinstance(docs[0], list) else docs
         except Exception:
             return []
+        else:
+            if self._versions.get(user_id, 0) == version:
+                self._cache_put(user_id, limit, prefs)
+            return prefs
+        finally:
+            self._reading[user_id] -= 1
+            if not self._reading[user_id]:
+                del self._reading[user_id]
+                self._versions.pop(user_id, None)
 
     async def save_optimization_run(self, user_id: str, run_data: Dict) -> str:
         """Save optimization run for learning"""
         doc_id = str(uuid.uuid4())
         summary = f"User {user_id} saved €{run_data.get('savings_eur', 0)} by shifting {run_data.get('kwh_flexible', 0)} kWh"
 
-        self.collection.add(
+        # Runs are not preferences, so the user's cached preferences stay valid
+        await asyncio.to_thread(
+            self.collection.add,
             documents=[summary],
             metadatas=[{
                 "user_id": user_id,
@@ -61,3 +125,7 @@ class MemoryStore:
             ids=[doc_id],
         )
         return doc_id
+
+
+# Shared store: one Chroma client and one preference cache for the agent and /prefs
+memory_store = MemoryStore(cache_size=settings.prefs_cache_size)
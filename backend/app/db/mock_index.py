@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import json
+import os
+from app.config import settings
+
+
+class MockDataIndex:
+    """
+    In-memory index of the JSON files in MOCK_DATA_DIR.
+
+    Files are parsed once and served from memory afterwards. The directory
+    listing is refreshed when the directory mtime changes (files added or
+    removed) and a single file is re-parsed when its own mtime changes, so a
+    lookup costs at most two stat calls.
+    """
+
+    def __init__(self, directory: Optional[str]):
+        self.directory = directory
+        self._dir_mtime: Optional[int] = None
+        self._names: set = set()
+        self._entries: Dict[str, Tuple[int, List[Dict]]] = {}
+
+    @staticmethod
+    def file_name(zone_eic: str, date_str: str, kind: str) -> str:
+        """
+        kind: "prices" or "loads"
+        filename: {zone}_{date}.{kind}.json  e.g. 10YNL----------L_2025-09-05.prices.json
+        """
+        return f"{zone_eic}_{date_str}.{kind}.json"
+
+    def _refresh_listing(self):
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except (OSError, TypeError):
+            self._dir_mtime, self._names = None, set()
+            self._entries.clear()
+            return
+        if mtime == self._dir_mtime:
+            return
+        self._dir_mtime = mtime
+        self._names = {entry.name for entry in os.scandir(self.directory) if entry.name.endswith(".json")}
+        for name in list(self._entries):
+            if name not in self._names:
+                del self._entries[name]
+
+    @staticmethod
+    def _parse(path: str) -> List[Dict]:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # Coerce hour_utc back to datetime objects if strings
+        for d in data:
+            if isinstance(d.get("hour_utc"), str):
+                d["hour_utc"] = datetime.fromisoformat(d["hour_utc"].replace("Z", "+00:00"))
+        return data
+
+    def get(self, zone_eic: str, date_str: str, kind: str) -> List[Dict]:
+        """Records for a zone/date/kind, or [] if no such file exists"""
+        if not self.directory:
+            return []
+        self._refresh_listing()
+        name = self.file_name(zone_eic, date_str, kind)
+        if name not in self._names:
+            return []
+
+        path = os.path.join(self.directory, name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._entries.pop(name, None)
+            return []
+
+        cached = self._entries.get(name)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, self._parse(path))
+            self._entries[name] = cached
+        # Shallow copy so callers can't reorder or truncate the cached list
+        return list(cached[1])
+
+    def clear(self):
+        self._dir_mtime = None
+        self._names = set()
+        self._entries.clear()
+
+
+# Global index instance
+mock_index = MockDataIndex(settings.mock_data_dir)
@@ -1,5 +1,7 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
+import numpy as np
+from app.utils.timeseries import resample, slots_per_day
 
 
 class DataStorage:
@@ -8,28 +10,75 @@ class DataStorage:
     def __init__(self):
         self.prices = {}
         self.loads = {}
+        self.generation = {}
         self.runs = []
+        self.listeners: List[Callable[[str, str, str, List[Dict]], None]] = []
+
+    def subscribe(self, callback: Callable[[str, str, str, List[Dict]], None]):
+        """Call callback(kind, zone_eic, date_str, records) after each save (kind: prices, loads or generation)"""
+        self.listeners.append(callback)
+
+    def _notify(self, kind: str, zone_eic: str, date_str: str, records: List[Dict]):
+        for callback in self.listeners:
+            try:
+                callback(kind, zone_eic, date_str, records)
+            except Exception as e:
+                print(f"Storage listener error: {e}")
 
     def save_prices(self, zone_eic: str, date_str: str, prices: List[Dict]):
         """Save price data"""
         key = f"{zone_eic}_{date_str}"
         self.prices[key] = prices
+        self._notify("prices", zone_eic, date_str, prices)
 
     def get_prices(self, zone_eic: str, date_str: str) -> Optional[List[Dict]]:
         """Get price data"""
         key = f"{zone_eic}_{date_str}"
         return self.prices.get(key)
 
+    def get_price_matrix(self, zone_eic: str, dates: List[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        Stack stored prices (EUR/kWh) into a days x slots matrix.
+
+        Every day is resampled to the finest resolution in the range, so a
+        history that crosses the hourly to 15-minute switch keeps all its
+        rows. Missing days and incomplete days (fewer slots than their own
+        resolution implies) are left out; the returned dates label the kept rows.
+        """
+        kept, curves = [], []
+        for date_str in dates:
+            prices = self.get_prices(zone_eic, date_str)
+            if not prices or len(prices) < slots_per_day(prices):
+                continue
+            kept.append(date_str)
+            curves.append(np.array([p['price_eur_kwh'] for p in prices], dtype=np.float64))
+        if not curves:
+            return kept, np.empty((0, 0))
+        slots = max(len(c) for c in curves)
+        return kept, np.vstack([resample(c, slots) for c in curves])
+
     def save_load(self, zone_eic: str, date_str: str, loads: List[Dict]):
         """Save load data"""
         key = f"{zone_eic}_{date_str}"
         self.loads[key] = loads
+        self._notify("loads", zone_eic, date_str, loads)
 
     def get_load(self, zone_eic: str, date_str: str) -> Optional[List[Dict]]:
         """Get load data"""
         key = f"{zone_eic}_{date_str}"
         return self.loads.get(key)
 
+    def save_generation(self, zone_eic: str, date_str: str, generation: List[Dict]):
+        """Save generation per production type"""
+        key = f"{zone_eic}_{date_str}"
+        self.generation[key] = generation
+        self._notify("generation", zone_eic, date_str, generation)
+
+    def get_generation(self, zone_eic: str, date_str: str) -> Optional[List[Dict]]:
+        """Get generation per production type"""
+        key = f"{zone_eic}_{date_str}"
+        return self.generation.get(key)
+
     def save_run(self, run_data: Dict):
         """Save optimization run"""
         run_data['timestamp'] = datetime.now().isoformat()
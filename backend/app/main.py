@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.api import ingest, optimize, agent
+from app.api import ingest, optimize, agent, backtest, forecast, subscribe
 
 app = FastAPI(
     title="ENTSO-E Energy Optimizer",
@@ -22,6 +22,9 @@ app.add_middleware(
 app.include_router(ingest.router, tags=["Data Ingestion"])
 app.include_router(optimize.router, tags=["Optimization"])
 app.include_router(agent.router, tags=["AI Agent"])
+app.include_router(backtest.router, tags=["Backtesting"])
+app.include_router(forecast.router, tags=["Forecasting"])
+app.include_router(subscribe.router, tags=["Subscriptions"])
 
 
 @app.get("/")
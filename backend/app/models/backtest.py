@@ -0,0 +1,78 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
+from datetime import datetime
+
+# Longest start_date..end_date range for one backtest request (about 10 years)
+MAX_BACKTEST_DAYS = 3653
+
+
+class BacktestStrategy(BaseModel):
+    strategy: Literal["cheapest_n", "contiguous", "capped"] = Field(
+        default="cheapest_n",
+        description="cheapest_n: N cheapest slots (LoadOptimizer.optimize); "
+                    "contiguous: cheapest unbroken block; capped: cheapest slots under a power cap",
+    )
+    kwh_flexible: float = Field(gt=0, default=6.0, description="Flexible load in kWh per day")
+    max_shift_hours: float = Field(gt=0, le=24, default=3, description="Hours of slots used by cheapest_n/contiguous")
+    max_kw: Optional[float] = Field(default=None, gt=0, description="Power cap per slot for the capped strategy")
+
+
+class BacktestRequest(BaseModel):
+    zone_eic: str = Field(default="10YNL----------L")
+    start_date: str = Field(description="First day, YYYY-MM-DD")
+    end_date: str = Field(description="Last day (inclusive), YYYY-MM-DD")
+    source: Literal["storage", "synthetic"] = Field(
+        default="storage", description="Stored price history or the synthetic market generator"
+    )
+    strategies: List[BacktestStrategy] = Field(default_factory=lambda: [BacktestStrategy()], min_length=1)
+    workers: int = Field(default=1, ge=1, le=32, description="Upper bound on processes for large strategy sweeps (capped at the CPU count)")
+
+    @model_validator(mode="after")
+    def check_range(self):
+        # Bounds the date list and the days x slots price matrix built for the request
+        start = datetime.strptime(self.start_date, "%Y-%m-%d")
+        end = datetime.strptime(self.end_date, "%Y-%m-%d")
+        if end < start:
+            raise ValueError("end_date must not be before start_date")
+        days = (end - start).days + 1
+        if days > MAX_BACKTEST_DAYS:
+            raise ValueError(f"backtest range must not exceed {MAX_BACKTEST_DAYS} days; got {days}")
+        return self
+
+
+class BacktestDay(BaseModel):
+    date_utc: str
+    savings_eur: float
+    baseline_cost_eur: float
+
+
+class BacktestMonth(BaseModel):
+    month: str
+    days: int
+    mean_savings_eur: float
+    total_savings_eur: float
+
+
+class BacktestResult(BaseModel):
+    params: BacktestStrategy
+    days: int
+    mean_savings_eur: float
+    median_savings_eur: float
+    p5_savings_eur: float
+    p95_savings_eur: float
+    total_savings_eur: float
+    mean_savings_percent: float
+    positive_days_share: float
+    worst_days: List[BacktestDay]
+    monthly: List[BacktestMonth]
+
+
+class BacktestResponse(BaseModel):
+    zone_eic: str
+    start_date: str
+    end_date: str
+    days: int
+    skipped_days: int
+    slots_per_day: int
+    results: List[BacktestResult]
+    elapsed_ms: Optional[float] = None
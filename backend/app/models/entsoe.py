@@ -6,7 +6,7 @@ from datetime import datetime
 class EntsoeIngestRequest(BaseModel):
     zone_eic: str = Field(default="10YNL----------L")
     date_utc: str = Field(description="Date in YYYY-MM-DD format")
-    fetch: List[str] = Field(default=["day_ahead_prices", "actual_load"])
+    fetch: List[str] = Field(default=["day_ahead_prices", "actual_load", "generation_per_type"])
 
 
 class EntsoeIngestResponse(BaseModel):
@@ -14,6 +14,7 @@ class EntsoeIngestResponse(BaseModel):
     hours: int
     has_prices: bool
     has_load: bool
+    has_generation: bool = False
     data: Optional[Dict[str, Any]] = None
 
 
@@ -26,3 +27,9 @@ class PricePoint(BaseModel):
 class LoadPoint(BaseModel):
     hour_utc: datetime
     load_mw: float
+
+
+class GenerationPoint(BaseModel):
+    hour_utc: datetime
+    psr_type: str
+    generation_mw: float
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from app.models.entsoe import PricePoint
+
+
+class ForecastPricePoint(PricePoint):
+    is_forecast: bool = True
+
+
+class PriceForecastResponse(BaseModel):
+    zone_eic: str
+    date_utc: str
+    is_forecast: bool
+    model: str
+    trained_days: int
+    mae_eur_mwh: Optional[float] = None
+    prices: List[ForecastPricePoint]
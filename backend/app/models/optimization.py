@@ -1,12 +1,22 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from app.services.battery_optimizer import BatteryOptimizer
+
+# Upper bound on DP cells (slots x levels x moves over all sites) for one
+# /optimize/storage/batch request, about 5 s of solver time
+MAX_BATCH_DP_CELLS = 1_000_000_000
+# Slot counts the cell estimate is taken over: PT60M and PT15M days
+BATCH_SLOTS_PER_DAY = (24, 96)
 
 
 class OptimizeRequest(BaseModel):
     kwh_flexible: float = Field(gt=0, description="Flexible load in kWh")
     max_shift_hours: int = Field(ge=1, le=24, default=3)
-    objective: str = Field(default="min_cost", description="Optimization objective")
+    objective: str = Field(default="min_cost", description="min_cost, min_carbon, min_peak or weighted")
+    weights: Optional[Dict[str, float]] = Field(
+        default=None, description="For objective=weighted: weights for cost, carbon and/or peak"
+    )
     zone_eic: str = Field(default="10YNL----------L")
     date_utc: str
 
@@ -24,6 +34,121 @@ class OptimizeResponse(BaseModel):
     savings_percent: float
     schedule: List[ShiftHour]
     price_curve: Optional[List[dict]] = None
+    is_forecast: bool = False
+    objective: str = "min_cost"
+    baseline_co2_kg: Optional[float] = None
+    optimized_co2_kg: Optional[float] = None
+
+
+class ScheduleUpdate(BaseModel):
+    zone_eic: str
+    date_utc: str
+    kwh_flexible: float
+    max_shift_hours: int
+    result: OptimizeResponse
+
+
+class StorageOptimizeRequest(BaseModel):
+    capacity_kwh: float = Field(gt=0, description="Usable battery capacity in kWh")
+    max_charge_kw: float = Field(gt=0, description="Grid-side charge power limit")
+    max_discharge_kw: float = Field(gt=0, description="Grid-side discharge power limit")
+    round_trip_efficiency: float = Field(gt=0, le=1, default=0.9)
+    initial_soc_kwh: float = Field(ge=0, default=0.0)
+    final_soc_kwh: Optional[float] = Field(ge=0, default=None, description="Defaults to initial_soc_kwh")
+    zone_eic: str = Field(default="10YNL----------L")
+    date_utc: str
+
+
+class StorageSlot(BaseModel):
+    hour_utc: datetime
+    price_eur_kwh: float
+    charge_kwh: float
+    discharge_kwh: float
+    soc_kwh: float
+
+
+class StorageOptimizeResponse(BaseModel):
+    baseline_cost_eur: float
+    optimized_cost_eur: float
+    savings_eur: float
+    savings_percent: Optional[float] = Field(
+        default=None, description="Relative to the uncontrolled baseline; None when that baseline is zero"
+    )
+    schedule: List[StorageSlot]
+    price_curve: Optional[List[dict]] = None
+    is_forecast: bool = False
+
+
+class StorageBatchRequest(BaseModel):
+    sites: List[StorageOptimizeRequest] = Field(min_length=1, max_length=10000)
+    soc_levels: int = Field(ge=2, le=1001, default=101, description="SoC discretization shared by the batch")
+
+    @model_validator(mode="after")
+    def check_size(self):
+        # Bounds DP work; memory is bounded separately by solving in chunks
+        solver = BatteryOptimizer(self.soc_levels)
+        sites = [s.model_dump() for s in self.sites]
+        cells = max(solver.dp_cells(sites, n) for n in BATCH_SLOTS_PER_DAY)
+        if cells > MAX_BATCH_DP_CELLS:
+            raise ValueError(
+                f"batch needs {cells:,} DP cells (slots x SoC levels x power steps), "
+                f"more than {MAX_BATCH_DP_CELLS:,}; send fewer sites or lower soc_levels"
+            )
+        return self
+
+
+class StorageBatchResponse(BaseModel):
+    results: List[StorageOptimizeResponse]
+    elapsed_ms: Optional[float] = None
+
+
+class MultiZoneRequest(BaseModel):
+    zones: List[str] = Field(min_length=1, max_length=50, description="Bidding zone EIC codes")
+    date_utc: str = Field(description="First day, YYYY-MM-DD")
+    horizon_days: int = Field(ge=1, le=7, default=1)
+    kwh_flexible: float = Field(gt=0, description="Flexible load in kWh over the horizon")
+    max_shift_hours: int = Field(ge=1, le=168, default=3)
+
+
+class ZoneComparison(BaseModel):
+    zone_eic: str
+    rank: int
+    baseline_cost_eur: float
+    optimized_cost_eur: float
+    savings_eur: float
+    savings_percent: float
+    mean_price_eur_kwh: float
+    min_price_eur_kwh: float
+    max_price_eur_kwh: float
+    price_spread_eur_kwh: float
+    is_forecast: bool = False
+    schedule: List[ShiftHour]
+
+
+class SlotWinner(BaseModel):
+    hour_utc: datetime
+    zone_eic: str
+    price_eur_kwh: float
+    spread_eur_kwh: float
+
+
+class CrossZoneShift(BaseModel):
+    hour_utc: datetime
+    zone_eic: str
+    shift_kwh: float
+    price_eur_kwh: float
+
+
+class MultiZoneResponse(BaseModel):
+    date_utc: str
+    horizon_days: int
+    slots_per_day: int
+    zones: List[ZoneComparison]
+    missing_zones: Dict[str, str] = Field(default_factory=dict)
+    cheapest_zone_per_slot: List[SlotWinner]
+    cross_zone_schedule: List[CrossZoneShift]
+    cross_zone_cost_eur: float
+    pairwise_mean_spread_eur_kwh: List[List[float]]
 
 
 class AgentAdviseRequest(BaseModel):
@@ -1,19 +1,19 @@
 from langchain_openai import ChatOpenAI
-from langchain.schema import SystemMessage, HumanMessage
-from typing import Dict, Any, Optional
+from langchain_core.messages import SystemMessage, HumanMessage
+from typing import Dict, Any, List, Optional
 import json
 from app.config import settings
-from app.db.memory import MemoryStore
+from app.db.memory import MemoryStore, memory_store
 
 
 class EnergyAdvisorAgent:
-    def __init__(self):
+    def __init__(self, store: Optional[MemoryStore] = None):
         self.llm = ChatOpenAI(
             api_key=settings.openai_api_key,
             model="gpt-4.1",
             temperature=0.7
         ) if settings.openai_api_key else None
-        self.memory_store = MemoryStore()
+        self.memory_store = store or memory_store
 
     async def advise(
             self,
@@ -21,16 +21,21 @@ class EnergyAdvisorAgent:
             optimization_result: Dict[str, Any],
             context: Optional[str] = None,
             zone_eic: str = None,
-            date_str: str = None
+            date_str: str = None,
+            user_prefs: Optional[List[str]] = None
     ) -> Dict[str, Any]:
-        """Generate advice based on optimization results and user context"""
+        """
+        Generate advice based on optimization results and user context.
+        Pass `user_prefs` when the caller already fetched them concurrently.
+        """
 
         if not self.llm:
             # Return a mock response if no OpenAI key
             return self._generate_mock_advice(optimization_result)
 
         # Retrieve user preferences from memory
-        user_prefs = await self.memory_store.get_user_preferences(user_id)
+        if user_prefs is None:
+            user_prefs = await self.memory_store.get_user_preferences(user_id)
 
         # Build prompt
         system_prompt = """You are an expert energy advisor helping users optimize their electricity consumption.
@@ -61,7 +66,7 @@ class EnergyAdvisorAgent:
         """
 
         try:
-            response = self.llm.invoke([
+            response = await self.llm.ainvoke([
                 SystemMessage(content=system_prompt),
                 HumanMessage(content=human_prompt)
             ])
@@ -0,0 +1,181 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import math
+import multiprocessing
+import os
+import threading
+import numpy as np
+from app.utils.timeseries import slots_for_hours
+
+
+def date_range(start_date: str, end_date: str) -> List[str]:
+    """Inclusive list of YYYY-MM-DD strings"""
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    if end < start:
+        raise ValueError("end_date must not be before start_date")
+    return [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((end - start).days + 1)]
+
+
+def strategy_costs(prices: np.ndarray, params: Dict[str, Any], slot_hours: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Baseline and optimized cost per day for one strategy, all days at once.
+
+    prices: days x slots matrix in EUR/kWh. The baseline matches
+    LoadOptimizer.optimize: the flexible kWh bought at the day's average price.
+    """
+    kwh = params["kwh_flexible"]
+    days, slots = prices.shape
+    baseline = kwh * prices.mean(axis=1)
+    strategy = params.get("strategy", "cheapest_n")
+
+    if strategy == "cheapest_n":
+        # Same rule as LoadOptimizer.optimize: spread evenly over the cheapest
+        # max_shift_hours worth of slots (slots_for_hours)
+        n = slots_for_hours(params["max_shift_hours"], slots)
+        cheapest = np.partition(prices, n - 1, axis=1)[:, :n]
+        optimized = kwh * cheapest.mean(axis=1)
+
+    elif strategy == "contiguous":
+        # Cheapest unbroken block of N slots within the day
+        n = slots_for_hours(params["max_shift_hours"], slots)
+        csum = np.concatenate([np.zeros((days, 1)), np.cumsum(prices, axis=1)], axis=1)
+        window_means = (csum[:, n:] - csum[:, :-n]) / n
+        optimized = kwh * window_means.min(axis=1)
+
+    elif strategy == "capped":
+        # Fill the cheapest slots up to max_kw each; the last slot takes the remainder
+        if not params.get("max_kw"):
+            raise ValueError("capped strategy requires max_kw")
+        cap = params["max_kw"] * slot_hours
+        m = math.ceil(kwh / cap - 1e-9)
+        if m > slots:
+            raise ValueError(f"{kwh} kWh does not fit in one day at {params['max_kw']} kW")
+        cheapest = np.partition(prices, m - 1, axis=1)[:, :m]
+        cheapest.sort(axis=1)
+        optimized = cap * cheapest[:, :m - 1].sum(axis=1) + (kwh - cap * (m - 1)) * cheapest[:, m - 1]
+
+    else:
+        raise ValueError(f"Unknown strategy {strategy}")
+
+    return baseline, optimized
+
+
+def summarize(
+        dates: np.ndarray,
+        baseline: np.ndarray,
+        optimized: np.ndarray,
+        params: Dict[str, Any],
+        worst_n: int = 5,
+) -> Dict[str, Any]:
+    """Distributional savings stats, worst days and a per-month breakdown"""
+    savings = baseline - optimized
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = np.where(baseline > 0, savings / baseline * 100, 0.0)
+
+    worst_n = min(worst_n, len(savings))
+    worst_idx = np.argpartition(savings, worst_n - 1)[:worst_n] if worst_n else np.array([], dtype=int)
+    worst_idx = worst_idx[np.argsort(savings[worst_idx])]
+
+    months = np.array([d[:7] for d in dates])
+    month_keys, inverse = np.unique(months, return_inverse=True)
+    month_days = np.bincount(inverse)
+    month_totals = np.bincount(inverse, weights=savings)
+
+    return {
+        'params': params,
+        'days': int(len(savings)),
+        'mean_savings_eur': round(float(savings.mean()), 4),
+        'median_savings_eur': round(float(np.median(savings)), 4),
+        'p5_savings_eur': round(float(np.percentile(savings, 5)), 4),
+        'p95_savings_eur': round(float(np.percentile(savings, 95)), 4),
+        'total_savings_eur': round(float(savings.sum()), 2),
+        'mean_savings_percent': round(float(percent.mean()), 1),
+        'positive_days_share': round(float((savings > 0).mean()), 4),
+        'worst_days': [
+            {
+                'date_utc': str(dates[i]),
+                'savings_eur': round(float(savings[i]), 4),
+                'baseline_cost_eur': round(float(baseline[i]), 4),
+            }
+            for i in worst_idx
+        ],
+        'monthly': [
+            {
+                'month': str(month),
+                'days': int(n),
+                'mean_savings_eur': round(float(total / n), 4),
+                'total_savings_eur': round(float(total), 2),
+            }
+            for month, n, total in zip(month_keys, month_days, month_totals)
+        ],
+    }
+
+
+def evaluate(dates: np.ndarray, prices: np.ndarray, params: Dict[str, Any], slot_hours: float) -> Dict[str, Any]:
+    baseline, optimized = strategy_costs(prices, params, slot_hours)
+    return summarize(dates, baseline, optimized, params)
+
+
+# ---------- process pool plumbing ----------
+# One pool for the life of the process, started with "spawn": forking a
+# threaded server (uvicorn, the anyio thread pool, Chroma) is unsafe, and
+# building a pool per request cost more than the evaluation itself.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Below this many matrix cells times parameter sets, shipping the matrix to
+# workers costs more than evaluating serially (5 years of PT15M with three
+# strategies is ~0.5M cells and ~25 ms serial).
+PARALLEL_MIN_CELLS = 5_000_000
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _evaluate_chunk(
+        dates: np.ndarray,
+        prices: np.ndarray,
+        param_sets: List[Dict[str, Any]],
+        slot_hours: float
+) -> List[Dict[str, Any]]:
+    return [evaluate(dates, prices, params, slot_hours) for params in param_sets]
+
+
+def run_backtest(
+        dates: List[str],
+        prices: np.ndarray,
+        param_sets: List[Dict[str, Any]],
+        workers: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate every parameter set over the full days x slots matrix.
+
+    With workers > 1, more than one core and a sweep large enough to pay for
+    it, parameter sets are split into chunks on the shared process pool; the
+    matrix is sent once per chunk, not once per parameter set.
+    """
+    if prices.size == 0:
+        raise ValueError("No price history available for the requested range")
+    slot_hours = 24 / prices.shape[1]
+    dates_arr = np.asarray(dates)
+
+    n_chunks = min(workers, len(param_sets), os.cpu_count() or 1)
+    if n_chunks <= 1 or prices.size * len(param_sets) < PARALLEL_MIN_CELLS:
+        return _evaluate_chunk(dates_arr, prices, param_sets, slot_hours)
+
+    chunks = [param_sets[i::n_chunks] for i in range(n_chunks)]
+    futures = [_get_pool().submit(_evaluate_chunk, dates_arr, prices, chunk, slot_hours) for chunk in chunks]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(param_sets)
+    for i, future in enumerate(futures):
+        results[i::n_chunks] = future.result()
+    return results
@@ -0,0 +1,255 @@
+from typing import Any, Dict, List
+import numpy as np
+
+INF = np.inf
+
+# Policy memory per DP pass (slots x sites x levels int16); larger batches are solved in chunks
+MAX_POLICY_BYTES = 64 * 2 ** 20
+# A site's grid may be refined to at most this many times the requested levels
+MAX_REFINEMENT = 4
+
+
+class BatteryOptimizer:
+    """
+    Cost-optimal charge/discharge schedules for home batteries and EV chargers.
+
+    Backward dynamic programming over a discretized state of charge. A batch
+    of sites is solved in one pass: each time step is a (sites x levels x
+    moves) numpy reduction, where moves are the SoC steps allowed by the
+    power limits.
+
+    The grid step is capacity / (soc_levels - 1), refined per site so that
+    one slot at full charge power is a whole number of steps: a 3.7 kW
+    charger on a 75 kWh battery charges at its full 0.925 kWh per 15 minutes
+    instead of being floored to the grid (or to zero).
+    """
+
+    def __init__(self, soc_levels: int = 101):
+        if soc_levels < 2:
+            raise ValueError("soc_levels must be at least 2")
+        self.soc_levels = soc_levels
+
+    def _site_arrays(self, sites: List[Dict[str, Any]], slot_hours: float) -> Dict[str, np.ndarray]:
+        """Per-site grid step, move bounds, top level and start/end level indices"""
+        capacity = np.array([s['capacity_kwh'] for s in sites], dtype=np.float64)
+        eta = np.array([s['round_trip_efficiency'] for s in sites], dtype=np.float64)
+        eta_c = eta_d = np.sqrt(eta)  # split losses evenly between charging and discharging
+
+        # Stored kWh per slot at the grid-side power limits
+        e_up = np.array([s['max_charge_kw'] for s in sites], dtype=np.float64) * slot_hours * eta_c
+        e_dn = np.array([s['max_discharge_kw'] for s in sites], dtype=np.float64) * slot_hours / eta_d
+
+        # Step: an exact divisor of a full-power charging slot, no coarser than the
+        # requested resolution or one discharging slot (discharge is floored to it)
+        base = capacity / (self.soc_levels - 1)
+        d_e = e_up / np.ceil(e_up / np.minimum(base, e_dn) - 1e-9)
+        max_top = MAX_REFINEMENT * (self.soc_levels - 1)
+        too_fine = capacity / d_e > max_top + 1e-9
+        d_e = np.where(too_fine, capacity / max_top, d_e)
+        top = np.floor(capacity / d_e + 1e-9).astype(np.int64)
+
+        up = np.minimum(np.floor(e_up / d_e + 1e-9), top).astype(np.int64)
+        down = np.minimum(np.floor(e_dn / d_e + 1e-9), top).astype(np.int64)
+
+        initial = np.array([s['initial_soc_kwh'] for s in sites], dtype=np.float64)
+        final = np.array([
+            s['initial_soc_kwh'] if s.get('final_soc_kwh') is None else s['final_soc_kwh'] for s in sites
+        ], dtype=np.float64)
+        if np.any(initial > capacity + 1e-9) or np.any(final > capacity + 1e-9):
+            raise ValueError("State of charge cannot exceed capacity")
+        start = np.minimum(np.rint(initial / d_e), top).astype(np.int64)
+        end = np.minimum(np.rint(final / d_e), top).astype(np.int64)
+        return {
+            'd_e': d_e, 'eta_c': eta_c, 'eta_d': eta_d, 'e_up': e_up, 'e_dn': e_dn,
+            'up': up, 'down': down, 'top': top, 'start': start, 'end': end,
+        }
+
+    def dp_cells(self, sites: List[Dict[str, Any]], n_slots: int) -> int:
+        """
+        Work of the backward pass: slots x levels x moves, summed over sites.
+        Moves grow with power relative to capacity, so this (not sites x
+        soc_levels) is what bounds solve time.
+        """
+        a = self._site_arrays(sites, 24 / n_slots)
+        return int((n_slots * (a['top'] + 1) * (a['up'] + a['down'] + 1)).sum())
+
+    def optimize_batch(self, prices: np.ndarray, sites: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Solve all sites, in chunks that keep the policy under MAX_POLICY_BYTES.
+
+        prices: sites x slots matrix in EUR/kWh (one row per site, so sites in
+        different zones can share a batch). Returns grid-side charge and
+        discharge kWh per slot, SoC after each slot and the cost per site.
+        """
+        n_sites, n_slots = prices.shape
+        if n_sites != len(sites):
+            raise ValueError("One price row is required per site")
+        arrays = self._site_arrays(sites, 24 / n_slots)
+
+        # Chunk sites so that slots x chunk x levels int16 stays within budget;
+        # sorting by level count, then move count, keeps similar grids (and
+        # little padding) together
+        order = np.lexsort((arrays['up'] + arrays['down'], arrays['top']))
+        parts = []
+        i = 0
+        while i < n_sites:
+            size = n_sites - i
+            while True:
+                chunk = order[i:i + size]
+                levels = int(arrays['top'][chunk[-1]]) + 1  # sorted: the last site has the most levels
+                fit = max(1, MAX_POLICY_BYTES // (n_slots * 2 * levels))
+                if fit >= size:
+                    break
+                size = fit
+            parts.append((chunk, self._solve(prices[chunk], {k: v[chunk] for k, v in arrays.items()})))
+            i += size
+
+        solved = {
+            key: np.empty((n_sites, n_slots)) for key in ('charge_kwh', 'discharge_kwh', 'soc_kwh')
+        }
+        solved['cost_eur'] = np.empty(n_sites)
+        for chunk, part in parts:
+            for key, value in part.items():
+                solved[key][chunk] = value
+        if not np.all(np.isfinite(solved['cost_eur'])):
+            bad = np.flatnonzero(~np.isfinite(solved['cost_eur'])).tolist()
+            raise ValueError(f"Final state of charge is unreachable for sites {bad}")
+        solved.update(
+            start_soc_kwh=arrays['start'] * arrays['d_e'],
+            end_soc_kwh=arrays['end'] * arrays['d_e'],
+            eta_c=arrays['eta_c'],
+            eta_d=arrays['eta_d'],
+            e_up=arrays['e_up'],
+            e_dn=arrays['e_dn'],
+        )
+        return solved
+
+    @staticmethod
+    def _solve(prices: np.ndarray, a: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """One backward DP pass plus the forward walk for a chunk of sites"""
+        n_sites, n_slots = prices.shape
+        d_e, eta_c, eta_d = a['d_e'], a['eta_c'], a['eta_d']
+        levels = int(a['top'].max()) + 1
+        rows = np.arange(n_sites)
+
+        # Moves are SoC level offsets -max_down..max_up shared by the chunk; each
+        # site blocks the ones its power limits do not allow.
+        k_down, k_up = int(a['down'].max()), int(a['up'].max())
+        offsets = np.arange(-k_down, k_up + 1)
+        delta = offsets[None, :] * d_e[:, None]  # stored kWh per move, sites x moves
+        grid = np.where(delta > 0, delta / eta_c[:, None], delta * eta_d[:, None])
+        allowed = (offsets[None, :] <= a['up'][:, None]) & (-offsets[None, :] <= a['down'][:, None])
+        blocked = np.where(allowed, 0.0, INF)  # sites x moves
+        # Levels above a site's capacity (sites on a coarser grid than the chunk's finest)
+        above = np.arange(levels)[None, :] > a['top'][:, None]
+        has_above = bool(above.any())
+
+        # Value of each level after the last slot: only the target SoC is acceptable
+        value = np.full((n_sites, levels), INF)
+        value[rows, a['end']] = 0.0
+        policy = np.empty((n_slots, n_sites, levels), dtype=np.int16)
+
+        # Successor values live in a padded buffer so move k is the slice [k, k + levels)
+        padded = np.full((n_sites, levels + k_down + k_up), INF)
+        best = np.empty((n_sites, levels))
+        candidate = np.empty((n_sites, levels))
+        better = np.empty((n_sites, levels), dtype=bool)
+
+        for t in range(n_slots - 1, -1, -1):
+            padded[:, k_down:k_down + levels] = value
+            step_cost = prices[:, t, None] * grid + blocked
+            best.fill(INF)
+            choice = policy[t]
+            choice.fill(0)
+            # Loop over the (few) moves, vectorized over sites x levels
+            for k in range(len(offsets)):
+                np.add(padded[:, k:k + levels], step_cost[:, k, None], out=candidate)
+                np.less(candidate, best, out=better)
+                np.copyto(best, candidate, where=better)
+                choice[better] = k
+            if has_above:
+                best[above] = INF
+            value = best.copy()
+
+        cost = value[rows, a['start']]
+
+        # Forward pass along the stored policy
+        level = a['start'].copy()
+        moves = np.empty((n_sites, n_slots), dtype=np.int64)
+        soc_levels = np.empty((n_sites, n_slots), dtype=np.int64)
+        for t in range(n_slots):
+            move = offsets[policy[t, rows, level]]
+            moves[:, t] = move
+            level = level + move
+            soc_levels[:, t] = level
+
+        stored = moves * d_e[:, None]
+        return {
+            'charge_kwh': np.where(stored > 0, stored / eta_c[:, None], 0.0),
+            'discharge_kwh': np.where(stored < 0, -stored * eta_d[:, None], 0.0),
+            'soc_kwh': soc_levels * d_e[:, None],
+            'cost_eur': cost,
+        }
+
+    @staticmethod
+    def baseline_costs(prices: np.ndarray, solved: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Uncontrolled operation: from the first slot, charge (or discharge) at
+        full power until the target SoC is reached, then stay idle. For an EV
+        this is plugging in and charging straight away; a battery that must
+        end where it started has a zero baseline.
+        """
+        net = solved['end_soc_kwh'] - solved['start_soc_kwh']
+        rate = np.where(net >= 0, solved['e_up'], solved['e_dn'])
+        elapsed = np.arange(1, prices.shape[1] + 1)
+        moved = np.minimum(rate[:, None] * elapsed[None, :], np.abs(net)[:, None])
+        stored = np.diff(moved, axis=1, prepend=0.0)
+        grid = np.where(net[:, None] > 0, stored / solved['eta_c'][:, None], -stored * solved['eta_d'][:, None])
+        return (grid * prices).sum(axis=1)
+
+    def optimize(self, prices: List[Dict], site: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Single site-day. Baseline is uncontrolled charging (baseline_costs);
+        savings_percent is None when that baseline costs nothing, e.g. pure
+        arbitrage with equal start and end SoC.
+        """
+        if not prices:
+            raise ValueError("No price data available")
+        matrix = np.array([[p['price_eur_kwh'] for p in prices]], dtype=np.float64)
+        solved = self.optimize_batch(matrix, [site])
+        return self.to_result(prices, matrix[0], solved, 0, self.baseline_costs(matrix, solved)[0])
+
+    @staticmethod
+    def to_result(
+            prices: List[Dict],
+            row: np.ndarray,
+            solved: Dict[str, np.ndarray],
+            i: int,
+            baseline: float,
+            include_curve: bool = True,
+    ) -> Dict[str, Any]:
+        optimized = float(solved['cost_eur'][i])
+        savings = float(baseline) - optimized
+        # Relative savings only mean something against a positive baseline bill
+        savings_percent = round(savings / baseline * 100, 1) if baseline > 0 else None
+
+        schedule = [
+            {
+                'hour_utc': p['hour_utc'],
+                'price_eur_kwh': float(row[t]),
+                'charge_kwh': round(float(solved['charge_kwh'][i, t]), 3),
+                'discharge_kwh': round(float(solved['discharge_kwh'][i, t]), 3),
+                'soc_kwh': round(float(solved['soc_kwh'][i, t]), 3),
+            }
+            for t, p in enumerate(prices)
+            if solved['charge_kwh'][i, t] > 0 or solved['discharge_kwh'][i, t] > 0
+        ]
+
+        return {
+            'baseline_cost_eur': round(float(baseline), 2),
+            'optimized_cost_eur': round(optimized, 2),
+            'savings_eur': round(savings, 2),
+            'savings_percent': savings_percent,
+            'schedule': schedule,
+            'price_curve': prices if include_curve else None
+        }
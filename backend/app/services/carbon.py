@@ -0,0 +1,60 @@
+from typing import Dict, List
+import numpy as np
+
+# Life-cycle emission factors in gCO2eq/kWh per ENTSO-E production type (psrType),
+# rounded from IPCC AR5 medians; storage and "other" use conservative mixes.
+EMISSION_FACTORS: Dict[str, float] = {
+    'B01': 230.0,   # Biomass
+    'B02': 1100.0,  # Fossil brown coal / lignite
+    'B03': 900.0,   # Fossil coal-derived gas
+    'B04': 490.0,   # Fossil gas
+    'B05': 820.0,   # Fossil hard coal
+    'B06': 650.0,   # Fossil oil
+    'B07': 1000.0,  # Fossil oil shale
+    'B08': 1000.0,  # Fossil peat
+    'B09': 38.0,    # Geothermal
+    'B10': 24.0,    # Hydro pumped storage
+    'B11': 24.0,    # Hydro run-of-river and poundage
+    'B12': 24.0,    # Hydro water reservoir
+    'B13': 24.0,    # Marine
+    'B14': 12.0,    # Nuclear
+    'B15': 30.0,    # Other renewable
+    'B16': 45.0,    # Solar
+    'B17': 330.0,   # Waste
+    'B18': 12.0,    # Wind offshore
+    'B19': 11.0,    # Wind onshore
+    'B20': 700.0,   # Other
+}
+DEFAULT_FACTOR = EMISSION_FACTORS['B20']
+
+
+def carbon_intensity(generation: List[Dict]) -> List[Dict]:
+    """
+    Generation-weighted carbon intensity per slot.
+
+    generation: records from parse_generation_per_type (one per slot and
+    production type). Returns [{'hour_utc', 'gco2_kwh'}] in time order.
+    """
+    if not generation:
+        return []
+
+    slots = sorted({g['hour_utc'] for g in generation})
+    index = {ts: i for i, ts in enumerate(slots)}
+    slot_idx = np.fromiter((index[g['hour_utc']] for g in generation), dtype=np.int64, count=len(generation))
+    mw = np.fromiter((max(g['generation_mw'], 0.0) for g in generation), dtype=np.float64, count=len(generation))
+    factor = np.fromiter(
+        (EMISSION_FACTORS.get(g['psr_type'], DEFAULT_FACTOR) for g in generation),
+        dtype=np.float64,
+        count=len(generation),
+    )
+
+    total = np.bincount(slot_idx, weights=mw, minlength=len(slots))
+    emitted = np.bincount(slot_idx, weights=mw * factor, minlength=len(slots))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        intensity = np.where(total > 0, emitted / total, np.nan)
+
+    return [
+        {'hour_utc': ts, 'gco2_kwh': round(float(v), 1)}
+        for ts, v in zip(slots, intensity)
+        if np.isfinite(v)
+    ]
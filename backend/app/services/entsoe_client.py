@@ -1,86 +1,100 @@
+import asyncio
 import httpx
-from datetime import datetime, timedelta
-from typing import Dict, List
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
 from app.config import settings
-from app.utils.xml_parser import parse_day_ahead_prices, parse_actual_load
-import random
-import json
-import os
+from app.utils.xml_parser import parse_day_ahead_prices, parse_actual_load, parse_generation_per_type
+from app.services.synthetic_market import SyntheticMarket
+from app.db.mock_index import mock_index
+
+synthetic_market = SyntheticMarket(
+    seed=settings.mock_seed,
+    resolution_minutes=settings.mock_resolution_minutes,
+)
+
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Never sleep longer than this per attempt, whatever Retry-After says
+MAX_RETRY_WAIT_S = 30.0
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds or HTTP date), None if absent or malformed"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
 
 
 class EntsoeClient:
     def __init__(self):
         self.base_url = settings.entsoe_base_url
         self.token = settings.entsoe_api_token
+        self.max_retries = settings.entsoe_max_retries
+        self.backoff_s = settings.entsoe_backoff_seconds
 
-    # ---------- helpers for mock files ----------
-    def _mock_file_path(self, zone_eic: str, date_str: str, kind: str) -> str:
+    # ---------- live requests ----------
+    async def _get(self, params: Dict) -> Optional[str]:
         """
-        kind: "prices" or "loads"
-        filename: {zone}_{date}.{kind}.json  e.g. 10YNL----------L_2025-09-05.prices.json
+        GET the transparency API with bounded retries on 429/5xx and transport
+        errors. Waits Retry-After when the server sends one, else exponential
+        backoff. Returns the body, or None once retries are exhausted or the
+        request is rejected outright (so callers never store a stand-in curve).
         """
-        fname = f"{zone_eic}_{date_str}.{kind}.json"
-        return os.path.join(settings.mock_data_dir, fname)
+        async with httpx.AsyncClient() as client:
+            for attempt in range(self.max_retries + 1):
+                wait = self.backoff_s * (2 ** attempt)
+                try:
+                    resp = await client.get(self.base_url, params=params, timeout=30.0)
+                except httpx.TransportError as e:
+                    error = f"{type(e).__name__}: {e}"
+                else:
+                    if resp.status_code == 200:
+                        return resp.text
+                    if resp.status_code not in RETRY_STATUSES:
+                        print(f"error: ENTSO-E {params.get('documentType')} returned {resp.status_code}")
+                        return None
+                    error = f"HTTP {resp.status_code}"
+                    retry_after = _retry_after(resp.headers.get("Retry-After"))
+                    if retry_after is not None:
+                        wait = retry_after
+                if attempt < self.max_retries:
+                    await asyncio.sleep(min(wait, MAX_RETRY_WAIT_S))
+            print(f"error: ENTSO-E {params.get('documentType')} failed after {self.max_retries + 1} attempts ({error})")
+            return None
 
-    def _load_mock_json(self, path: str) -> List[Dict]:
-        if not os.path.exists(path):
-            return []
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        # Coerce hour_utc back to datetime objects if strings
-        for d in data:
-            if isinstance(d.get("hour_utc"), str):
-                d["hour_utc"] = datetime.fromisoformat(d["hour_utc"].replace("Z", "+00:00"))
-        return data
-
-    # ---------- generators (fallback if file missing) ----------
-    def _generate_mock_prices(self, date: datetime) -> List[Dict]:
-        prices = []
-        base_price = 80  # €/MWh
-        rng = random.Random(42 + int(date.strftime("%Y%m%d")))  # deterministic-ish per date
-
-        for hour in range(24):
-            hour_time = date.replace(hour=hour, minute=0, second=0, microsecond=0)
-            if 0 <= hour <= 5:
-                multiplier = 0.7 + rng.uniform(-0.1, 0.1)
-            elif 6 <= hour <= 9:
-                multiplier = 1.2 + rng.uniform(-0.1, 0.2)
-            elif 10 <= hour <= 16:
-                multiplier = 1.0 + rng.uniform(-0.1, 0.1)
-            elif 17 <= hour <= 21:
-                multiplier = 1.3 + rng.uniform(-0.1, 0.2)
-            else:
-                multiplier = 0.9 + rng.uniform(-0.1, 0.1)
-            price = base_price * multiplier
-            prices.append({
-                'hour_utc': hour_time,
-                'price_eur_mwh': round(price, 2),
-                'price_eur_kwh': round(price / 1000, 5)
-            })
-        return prices
-
-    def _generate_mock_load(self, date: datetime) -> List[Dict]:
-        loads = []
-        base_load = 12000  # MW
-        rng = random.Random(99 + int(date.strftime("%Y%m%d")))
-        for hour in range(24):
-            hour_time = date.replace(hour=hour, minute=0, second=0, microsecond=0)
-            if 0 <= hour <= 5:
-                multiplier = 0.6 + rng.uniform(-0.05, 0.05)
-            elif 6 <= hour <= 9:
-                multiplier = 0.9 + rng.uniform(-0.05, 0.1)
-            elif 10 <= hour <= 17:
-                multiplier = 1.0 + rng.uniform(-0.05, 0.05)
-            elif 18 <= hour <= 21:
-                multiplier = 1.1 + rng.uniform(-0.05, 0.1)
-            else:
-                multiplier = 0.8 + rng.uniform(-0.05, 0.05)
-            load = base_load * multiplier
-            loads.append({
-                'hour_utc': hour_time,
-                'load_mw': round(load, 2)
-            })
-        return loads
+    # ---------- mock data (file index first, generator as fallback) ----------
+    def _mock_records(self, zone_eic: str, date_str: str, kind: str) -> List[Dict]:
+        if (settings.mock_source or "").lower() == "file":
+            data = mock_index.get(zone_eic, date_str, kind)
+            if data:
+                return data
+            # fallback to generator if file missing
+        date = datetime.strptime(date_str, "%Y-%m-%d")
+        if kind == "prices":
+            return self._generate_mock_prices(zone_eic, date)
+        if kind == "generation":
+            return self._generate_mock_generation(zone_eic, date)
+        return self._generate_mock_load(zone_eic, date)
+
+    def _generate_mock_prices(self, zone_eic: str, date: datetime) -> List[Dict]:
+        return synthetic_market.price_records(zone_eic, date)
+
+    def _generate_mock_load(self, zone_eic: str, date: datetime) -> List[Dict]:
+        return synthetic_market.load_records(zone_eic, date)
+
+    def _generate_mock_generation(self, zone_eic: str, date: datetime) -> List[Dict]:
+        return synthetic_market.generation_records(zone_eic, date)
 
     # ---------- public API ----------
     async def fetch_day_ahead_prices(self, zone_eic: str, date_str: str) -> List[Dict]:
@@ -88,15 +102,9 @@ class EntsoeClient:
 
         # MOCK mode via file or generator
         if settings.use_mock_data or not self.token:
-            if settings.mock_source.lower() == "file":
-                path = self._mock_file_path(zone_eic, date_str, "prices")
-                data = self._load_mock_json(path)
-                if data:
-                    return data
-                # fallback to generator if file missing
-            return self._generate_mock_prices(date)
-
-        # LIVE mode (unchanged)
+            return self._mock_records(zone_eic, date_str, "prices")
+
+        # LIVE mode: nothing (not synthetic data) when ENTSO-E cannot be reached
         try:
             period_start = (date - timedelta(hours=2)).strftime("%Y%m%d%H%M")
             period_end = (date + timedelta(hours=22)).strftime("%Y%m%d%H%M")
@@ -108,28 +116,23 @@ class EntsoeClient:
                 "periodEnd": period_end,
                 "securityToken": self.token
             }
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(self.base_url, params=params, timeout=30.0)
-                if resp.status_code == 200:
-                    prices = parse_day_ahead_prices(resp.text)
-                    return [p for p in prices if p['hour_utc'].date() == date.date()]
-                return self._generate_mock_prices(date)
+            body = await self._get(params)
+            if body is None:
+                return []
+            prices = parse_day_ahead_prices(body)
+            return [p for p in prices if p['hour_utc'].date() == date.date()]
         except Exception as e:
-            return self._generate_mock_prices(date)
+            print("error: ", str(e))
+            return []
 
     async def fetch_actual_load(self, zone_eic: str, date_str: str) -> List[Dict]:
         date = datetime.strptime(date_str, "%Y-%m-%d")
 
         # MOCK mode via file or generator
         if settings.use_mock_data or not self.token:
-            if settings.mock_source.lower() == "file":
-                path = self._mock_file_path(zone_eic, date_str, "loads")
-                data = self._load_mock_json(path)
-                if data:
-                    return data
-            return self._generate_mock_load(date)
-
-        # LIVE mode (unchanged)
+            return self._mock_records(zone_eic, date_str, "loads")
+
+        # LIVE mode
         try:
             period_start = (date - timedelta(hours=2)).strftime("%Y%m%d%H%M")
             period_end = (date + timedelta(hours=22)).strftime("%Y%m%d%H%M")
@@ -141,12 +144,38 @@ class EntsoeClient:
                 "periodEnd": period_end,
                 "securityToken": self.token
             }
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(self.base_url, params=params, timeout=30.0)
-                if resp.status_code == 200:
-                    loads = parse_actual_load(resp.text)
-                    return [l for l in loads if l['hour_utc'].date() == date.date()]
-                return self._generate_mock_load(date)
+            body = await self._get(params)
+            if body is None:
+                return []
+            loads = parse_actual_load(body)
+            return [l for l in loads if l['hour_utc'].date() == date.date()]
+        except Exception as e:
+            print("error: ", str(e))
+            return []
+
+    async def fetch_generation_per_type(self, zone_eic: str, date_str: str) -> List[Dict]:
+        date = datetime.strptime(date_str, "%Y-%m-%d")
+
+        # MOCK mode via file or generator
+        if settings.use_mock_data or not self.token:
+            return self._mock_records(zone_eic, date_str, "generation")
+
+        try:
+            period_start = (date - timedelta(hours=2)).strftime("%Y%m%d%H%M")
+            period_end = (date + timedelta(hours=22)).strftime("%Y%m%d%H%M")
+            params = {
+                "documentType": "A75",
+                "processType": "A16",
+                "in_Domain": zone_eic,
+                "periodStart": period_start,
+                "periodEnd": period_end,
+                "securityToken": self.token
+            }
+            body = await self._get(params)
+            if body is None:
+                return []
+            generation = parse_generation_per_type(body)
+            return [g for g in generation if g['hour_utc'].date() == date.date()]
         except Exception as e:
             print("error: ", str(e))
-            return self._generate_mock_load(date)
+            return []
@@ -0,0 +1,225 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.db.storage import DataStorage, storage
+from app.utils.timeseries import resample
+
+N_FEATURES = 10
+MIN_RIDGE_DAYS = 7
+MAX_HORIZON_DAYS = 7
+
+
+def _shift(date_str: str, days: int) -> str:
+    return (datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class _ZoneModel:
+    """Sufficient statistics for one zone's ridge model plus online error tracking"""
+
+    def __init__(self):
+        self.xtx = np.zeros((N_FEATURES, N_FEATURES))
+        self.xty = np.zeros(N_FEATURES)
+        # Per-day contributions, so a re-ingested or back-filled day replaces its old rows
+        self.days: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.abs_err = {"seasonal_naive": 0.0, "ridge": 0.0}
+        self.err_slots = 0
+        self.version = 0
+        self._weights: Optional[Tuple[int, np.ndarray]] = None
+
+    def add_day(self, date_str: str, xtx: np.ndarray, xty: np.ndarray):
+        old = self.days.pop(date_str, None)
+        if old is not None:
+            self.xtx -= old[0]
+            self.xty -= old[1]
+        self.days[date_str] = (xtx, xty)
+        self.xtx += xtx
+        self.xty += xty
+        self.version += 1
+
+    def weights(self, alpha: float) -> np.ndarray:
+        if self._weights is None or self._weights[0] != self.version:
+            penalty = alpha * np.eye(N_FEATURES)
+            penalty[0, 0] = 0.0  # do not shrink the intercept
+            self._weights = (self.version, np.linalg.solve(self.xtx + penalty, self.xty))
+        return self._weights[1]
+
+
+class PriceForecaster:
+    """
+    Provisional day-ahead price curves for dates ENTSO-E has not published yet.
+
+    Two lightweight models per zone, both trained on stored history:
+    - seasonal_naive: same slot one week earlier (falls back to yesterday)
+    - ridge: linear model on lagged prices, yesterday's actual load shape and
+      calendar terms, kept as X'X / X'y sums so each new day is an O(k^2) update
+
+    The model with the lower online (predict-then-train) error is used once the
+    ridge model has seen MIN_RIDGE_DAYS days. Forecasts are cached per zone and
+    date and dropped as soon as that zone receives new data.
+    """
+
+    def __init__(self, store: DataStorage, alpha: float = 10.0, cache_size: int = 1024):
+        self.storage = store
+        self.alpha = alpha
+        self.cache_size = cache_size
+        self.zones: Dict[str, _ZoneModel] = {}
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[int, Dict[str, Any]]]" = OrderedDict()
+
+    # ---------- history access ----------
+    def _stored_prices(self, zone_eic: str, date_str: str) -> Optional[np.ndarray]:
+        prices = self.storage.get_prices(zone_eic, date_str)
+        if not prices:
+            return None
+        return np.array([p['price_eur_mwh'] for p in prices], dtype=np.float64)
+
+    def _load_shape(self, zone_eic: str, date_str: str, slots: int) -> np.ndarray:
+        loads = self.storage.get_load(zone_eic, date_str)
+        if not loads:
+            return np.zeros(slots)
+        values = resample(np.array([l['load_mw'] for l in loads], dtype=np.float64), slots)
+        mean = values.mean()
+        return values / mean - 1 if mean > 0 else np.zeros(slots)
+
+    def _features(
+            self,
+            zone_eic: str,
+            date_str: str,
+            lag1: np.ndarray,
+            lag7: Optional[np.ndarray],
+    ) -> np.ndarray:
+        """slots x N_FEATURES design matrix for one target day"""
+        slots = len(lag1)
+        lag7 = lag1 if lag7 is None else resample(lag7, slots)
+        hour = np.arange(slots) * 24.0 / slots
+        weekend = 1.0 if datetime.strptime(date_str, "%Y-%m-%d").weekday() >= 5 else 0.0
+        return np.column_stack([
+            np.ones(slots),
+            lag1,
+            lag7,
+            np.full(slots, lag1.mean()),
+            self._load_shape(zone_eic, _shift(date_str, -1), slots),
+            np.full(slots, weekend),
+            np.sin(2 * np.pi * hour / 24),
+            np.cos(2 * np.pi * hour / 24),
+            np.sin(4 * np.pi * hour / 24),
+            np.cos(4 * np.pi * hour / 24),
+        ])
+
+    # ---------- training ----------
+    def on_storage_update(self, kind: str, zone_eic: str, date_str: str, records: List[Dict]):
+        """Storage listener: a new day updates its own rows and the rows that use it as a lag"""
+        if kind == "prices":
+            affected = [date_str, _shift(date_str, 1), _shift(date_str, 7)]
+        elif kind == "loads":
+            affected = [_shift(date_str, 1)]  # load only enters as yesterday's shape
+        else:
+            return
+        for target in affected:
+            self._train_day(zone_eic, target)
+        self._drop_cached(zone_eic)
+
+    def _train_day(self, zone_eic: str, date_str: str):
+        actual = self._stored_prices(zone_eic, date_str)
+        lag1 = self._stored_prices(zone_eic, _shift(date_str, -1))
+        if actual is None or lag1 is None:
+            return
+        lag1 = resample(lag1, len(actual))
+        lag7 = self._stored_prices(zone_eic, _shift(date_str, -7))
+        x = self._features(zone_eic, date_str, lag1, lag7)
+
+        model = self.zones.setdefault(zone_eic, _ZoneModel())
+        if date_str not in model.days:
+            # Score both models on the day before learning from it
+            naive = x[:, 2]
+            model.abs_err["seasonal_naive"] += float(np.abs(naive - actual).sum())
+            if len(model.days) >= MIN_RIDGE_DAYS:
+                ridge = x @ model.weights(self.alpha)
+                model.abs_err["ridge"] += float(np.abs(ridge - actual).sum())
+            else:
+                model.abs_err["ridge"] += float(np.abs(naive - actual).sum())
+            model.err_slots += len(actual)
+        model.add_day(date_str, x.T @ x, x.T @ actual)
+
+    def _drop_cached(self, zone_eic: str):
+        for key in [k for k in self._cache if k[0] == zone_eic]:
+            del self._cache[key]
+
+    # ---------- inference ----------
+    def _choose_model(self, zone_eic: str) -> str:
+        model = self.zones.get(zone_eic)
+        if model is None or len(model.days) < MIN_RIDGE_DAYS:
+            return "seasonal_naive"
+        return "ridge" if model.abs_err["ridge"] <= model.abs_err["seasonal_naive"] else "seasonal_naive"
+
+    def _day_curve(self, zone_eic: str, date_str: str, depth: int) -> Optional[np.ndarray]:
+        """Stored prices for a day, or a recursive forecast within the horizon"""
+        stored = self._stored_prices(zone_eic, date_str)
+        if stored is not None:
+            return stored
+        if depth >= MAX_HORIZON_DAYS:
+            return None
+        result = self._predict(zone_eic, date_str, depth + 1)
+        return None if result is None else result[1]
+
+    def _predict(self, zone_eic: str, date_str: str, depth: int = 0) -> Optional[Tuple[str, np.ndarray]]:
+        lag1 = self._day_curve(zone_eic, _shift(date_str, -1), depth)
+        if lag1 is None:
+            return None
+        lag7 = self._day_curve(zone_eic, _shift(date_str, -7), MAX_HORIZON_DAYS)  # stored only
+        x = self._features(zone_eic, date_str, lag1, lag7)
+
+        name = self._choose_model(zone_eic)
+        if name == "ridge":
+            return name, x @ self.zones[zone_eic].weights(self.alpha)
+        return name, x[:, 2]
+
+    def forecast(self, zone_eic: str, date_str: str) -> Optional[Dict[str, Any]]:
+        """
+        Provisional curve for a date without published prices.
+
+        Returns None when there is not enough history (yesterday's prices,
+        stored or forecast within MAX_HORIZON_DAYS).
+        """
+        model = self.zones.get(zone_eic)
+        version = model.version if model else 0
+        key = (zone_eic, date_str)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        predicted = self._predict(zone_eic, date_str)
+        if predicted is None:
+            return None
+        name, values = predicted
+
+        start = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        step = timedelta(days=1) / len(values)
+        result = {
+            'zone_eic': zone_eic,
+            'date_utc': date_str,
+            'is_forecast': True,
+            'model': name,
+            'trained_days': len(model.days) if model else 0,
+            'mae_eur_mwh': round(model.abs_err[name] / model.err_slots, 2) if model and model.err_slots else None,
+            'prices': [
+                {
+                    'hour_utc': start + step * i,
+                    'price_eur_mwh': round(float(v), 2),
+                    'price_eur_kwh': round(float(v) / 1000, 5),
+                    'is_forecast': True
+                }
+                for i, v in enumerate(values)
+            ]
+        }
+
+        self._cache[key] = (version, result)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+
+# Global forecaster instance, trained from every save to the global storage
+forecaster = PriceForecaster(storage)
+storage.subscribe(forecaster.on_storage_update)
@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+import numpy as np
+from app.utils.timeseries import resample
+
+
+def stack_curves(curves: List[List[List[Dict]]]) -> Tuple[np.ndarray, int]:
+    """
+    zones x slots matrix in EUR/kWh from per-zone lists of daily curves.
+
+    Every day is upsampled to the finest resolution present (e.g. hourly
+    zones next to quarter-hourly DE-LU), then days are laid end to end.
+    Returns the matrix and the slots per day.
+    """
+    slots = max(len(day) for zone_days in curves for day in zone_days)
+    matrix = np.vstack([
+        np.concatenate([
+            resample(np.array([p['price_eur_kwh'] for p in day], dtype=np.float64), slots) for day in zone_days
+        ])
+        for zone_days in curves
+    ])
+    return matrix, slots
+
+
+def compare_zones(
+        zones: List[str],
+        timestamps: List[datetime],
+        prices: np.ndarray,
+        kwh_flexible: float,
+        shift_slots: int,
+) -> Dict[str, Any]:
+    """
+    Per-zone schedules and a cross-zone ranking from one zones x slots matrix.
+
+    Each zone gets the LoadOptimizer rule: flexible kWh spread evenly over its
+    `shift_slots` cheapest slots (timeseries.slots_for_hours of
+    max_shift_hours, as LoadOptimizer uses), baseline at the average price. The
+    cross-zone part picks the cheapest zone per slot and the best schedule
+    when load may run in any zone.
+    """
+    n_zones, n_slots = prices.shape
+    n = int(min(max(shift_slots, 1), n_slots))
+    kwh_per_slot = kwh_flexible / n
+
+    # Per-zone cheapest slots, all zones in one pass (in time order within the zone)
+    chosen = np.sort(np.argpartition(prices, n - 1, axis=1)[:, :n], axis=1)
+    chosen_prices = np.take_along_axis(prices, chosen, axis=1)
+    mean_price = prices.mean(axis=1)
+    baseline = kwh_flexible * mean_price
+    optimized = kwh_per_slot * chosen_prices.sum(axis=1)
+    savings = baseline - optimized
+    with np.errstate(divide="ignore", invalid="ignore"):
+        savings_percent = np.where(baseline > 0, savings / baseline * 100, 0.0)
+    low, high = prices.min(axis=1), prices.max(axis=1)
+    rank = np.empty(n_zones, dtype=np.int64)
+    rank[np.argsort(optimized, kind="stable")] = np.arange(1, n_zones + 1)
+
+    # Cheapest zone per slot and the spread across zones
+    winner = prices.argmin(axis=0)
+    slot_min = prices.min(axis=0)
+    slot_spread = prices.max(axis=0) - slot_min
+
+    # If the load can run in any zone, take the n cheapest (slot, cheapest zone) cells
+    best_slots = np.sort(np.argpartition(slot_min, n - 1)[:n])
+    cross_cost = kwh_per_slot * slot_min[best_slots].sum()
+
+    # Pairwise mean price differences (row zone minus column zone), EUR/kWh
+    pairwise = mean_price[:, None] - mean_price[None, :]
+
+    return {
+        'zones': [
+            {
+                'zone_eic': zone,
+                'rank': int(rank[i]),
+                'baseline_cost_eur': round(float(baseline[i]), 2),
+                'optimized_cost_eur': round(float(optimized[i]), 2),
+                'savings_eur': round(float(savings[i]), 2),
+                'savings_percent': round(float(savings_percent[i]), 1),
+                'mean_price_eur_kwh': round(float(mean_price[i]), 5),
+                'min_price_eur_kwh': round(float(low[i]), 5),
+                'max_price_eur_kwh': round(float(high[i]), 5),
+                'price_spread_eur_kwh': round(float(high[i] - low[i]), 5),
+                'schedule': [
+                    {
+                        'hour_utc': timestamps[t],
+                        'shift_kwh': round(kwh_per_slot, 2),
+                        'price_eur_kwh': float(prices[i, t])
+                    }
+                    for t in chosen[i]
+                ]
+            }
+            for i, zone in enumerate(zones)
+        ],
+        'cheapest_zone_per_slot': [
+            {
+                'hour_utc': timestamps[t],
+                'zone_eic': zones[winner[t]],
+                'price_eur_kwh': float(slot_min[t]),
+                'spread_eur_kwh': round(float(slot_spread[t]), 5)
+            }
+            for t in range(n_slots)
+        ],
+        'cross_zone_schedule': [
+            {
+                'hour_utc': timestamps[t],
+                'zone_eic': zones[winner[t]],
+                'shift_kwh': round(kwh_per_slot, 2),
+                'price_eur_kwh': float(slot_min[t])
+            }
+            for t in best_slots
+        ],
+        'cross_zone_cost_eur': round(float(cross_cost), 2),
+        'pairwise_mean_spread_eur_kwh': np.round(pairwise, 5).tolist(),
+    }
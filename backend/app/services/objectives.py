@@ -0,0 +1,96 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.db.storage import DataStorage, storage
+from app.services.carbon import carbon_intensity
+from app.utils.timeseries import min_max, resample
+
+# Signals a schedule can be scored on, and the storage kind each one is derived from
+SIGNALS = {"cost": "prices", "carbon": "generation", "peak": "loads"}
+
+OBJECTIVES: Dict[str, Dict[str, float]] = {
+    "min_cost": {"cost": 1.0},
+    "min_carbon": {"carbon": 1.0},
+    "min_peak": {"peak": 1.0},
+}
+
+
+def objective_weights(objective: str, weights: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """Resolve an objective name (or "weighted" plus weights) to normalized signal weights"""
+    if objective != "weighted":
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective {objective}; use {', '.join(OBJECTIVES)} or weighted")
+        return OBJECTIVES[objective]
+
+    if not weights:
+        raise ValueError("weighted objective requires weights, e.g. {\"cost\": 0.7, \"carbon\": 0.3}")
+    unknown = set(weights) - set(SIGNALS)
+    if unknown:
+        raise ValueError(f"Unknown weight keys {sorted(unknown)}; use {', '.join(SIGNALS)}")
+    if any(w < 0 for w in weights.values()) or sum(weights.values()) <= 0:
+        raise ValueError("Weights must be non-negative with a positive sum")
+    total = sum(weights.values())
+    return {k: w / total for k, w in weights.items() if w > 0}
+
+
+class ObjectiveScores:
+    """
+    Per-zone, per-day score vectors for cost, carbon and peak load.
+
+    Vectors are built once, when storage saves prices, generation or load
+    (carbon intensity is derived from the generation mix here, not at request
+    time). Scoring a schedule for any objective is then a weighted sum of
+    cached min-max scaled vectors.
+    """
+
+    def __init__(self, store: DataStorage):
+        self.storage = store
+        # (zone, date) -> signal -> (raw values, values scaled to [0, 1])
+        self.vectors: Dict[Tuple[str, str], Dict[str, Tuple[np.ndarray, np.ndarray]]] = {}
+
+    def on_storage_update(self, kind: str, zone_eic: str, date_str: str, records: List[Dict]):
+        if kind == "prices":
+            signal, raw = "cost", np.array([p['price_eur_kwh'] for p in records], dtype=np.float64)
+        elif kind == "loads":
+            signal, raw = "peak", np.array([l['load_mw'] for l in records], dtype=np.float64)
+        elif kind == "generation":
+            intensity = carbon_intensity(records)
+            signal, raw = "carbon", np.array([c['gco2_kwh'] for c in intensity], dtype=np.float64)
+        else:
+            return
+        if raw.size == 0:
+            return
+        self.vectors.setdefault((zone_eic, date_str), {})[signal] = (raw, min_max(raw))
+
+    def has(self, zone_eic: str, date_str: str, signal: str) -> bool:
+        return signal in self.vectors.get((zone_eic, date_str), {})
+
+    def missing(self, zone_eic: str, date_str: str, weights: Dict[str, float]) -> List[str]:
+        """Signals (other than cost, which comes with the prices) not cached for this day"""
+        return [s for s in weights if s != "cost" and not self.has(zone_eic, date_str, s)]
+
+    def raw(self, zone_eic: str, date_str: str, signal: str, slots: int) -> Optional[np.ndarray]:
+        """Raw signal (EUR/kWh, gCO2/kWh or MW) resampled to the price resolution"""
+        entry = self.vectors.get((zone_eic, date_str), {}).get(signal)
+        return None if entry is None else resample(entry[0], slots)
+
+    def score(self, zone_eic: str, date_str: str, weights: Dict[str, float], prices: np.ndarray) -> np.ndarray:
+        """Weighted slot scores aligned with `prices`; lower is better"""
+        slots = len(prices)
+        cached = self.vectors.get((zone_eic, date_str), {})
+        total = np.zeros(slots)
+        for signal, weight in weights.items():
+            entry = cached.get(signal)
+            if signal == "cost" and (entry is None or len(entry[0]) != slots):
+                # Forecast or otherwise unstored curve: scale the prices we were given
+                scaled = min_max(prices)
+            elif entry is None:
+                raise ValueError(f"No {signal} data available for {zone_eic} on {date_str}")
+            else:
+                scaled = resample(entry[1], slots)
+            total += weight * scaled
+        return total
+
+
+# Global score cache, filled from every save to the global storage
+objective_scores = ObjectiveScores(storage)
+storage.subscribe(objective_scores.on_storage_update)
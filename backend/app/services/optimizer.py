@@ -1,7 +1,9 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import numpy as np
 from app.models.optimization import ShiftHour
+from app.services.objectives import objective_scores, objective_weights
+from app.utils.timeseries import slots_for_hours, slots_per_day
 
 
 class LoadOptimizer:
@@ -19,9 +21,10 @@ class LoadOptimizer:
             date_str: str,
             kwh_flexible: float,
             max_shift_hours: int,
-            objective: str = "min_cost"
+            objective: str = "min_cost",
+            weights: Optional[Dict[str, float]] = None
     ) -> Dict[str, Any]:
-        """Optimize load shifting based on prices"""
+        """Optimize load shifting based on prices, or on cost/carbon/peak scores"""
 
         key = f"{zone_eic}_{date_str}"
         prices = self.price_data.get(key, [])
@@ -29,14 +32,63 @@ class LoadOptimizer:
         if not prices:
             raise ValueError(f"No price data available for {zone_eic} on {date_str}")
 
-        # Sort hours by price
-        sorted_prices = sorted(prices, key=lambda x: x['price_eur_kwh'])
+        resolved = objective_weights(objective, weights)
+        price_arr = np.array([p['price_eur_kwh'] for p in prices], dtype=np.float64)
 
-        # Select cheapest hours for shifting
-        selected_hours = sorted_prices[:max_shift_hours]
+        if resolved == {"cost": 1.0}:
+            # Sort hours by price
+            order = np.argsort(price_arr, kind="stable")
+        else:
+            # Rank by the cached objective scores; price breaks ties
+            scores = objective_scores.score(zone_eic, date_str, resolved, price_arr)
+            order = np.lexsort((price_arr, scores))
 
-        # Distribute load evenly across selected hours
-        kwh_per_hour = kwh_flexible / max_shift_hours
+        return self._build_result(zone_eic, date_str, prices, order, kwh_flexible, max_shift_hours, objective)
+
+    def optimize_many(
+            self,
+            zone_eic: str,
+            date_str: str,
+            jobs: List[Tuple[float, int]]
+    ) -> List[Dict[str, Any]]:
+        """
+        min_cost results for many (kwh_flexible, max_shift_hours) jobs on one curve.
+
+        The price ranking is computed once and identical jobs share a result,
+        so thousands of subscribers cost one sort plus a few distinct builds.
+        """
+        key = f"{zone_eic}_{date_str}"
+        prices = self.price_data.get(key, [])
+
+        if not prices:
+            raise ValueError(f"No price data available for {zone_eic} on {date_str}")
+
+        price_arr = np.array([p['price_eur_kwh'] for p in prices], dtype=np.float64)
+        order = np.argsort(price_arr, kind="stable")
+        results: Dict[Tuple[float, int], Dict[str, Any]] = {}
+        for job in jobs:
+            if job not in results:
+                results[job] = self._build_result(zone_eic, date_str, prices, order, job[0], job[1], "min_cost")
+        return [results[job] for job in jobs]
+
+    def _build_result(
+            self,
+            zone_eic: str,
+            date_str: str,
+            prices: List[Dict],
+            order: np.ndarray,
+            kwh_flexible: float,
+            max_shift_hours: int,
+            objective: str
+    ) -> Dict[str, Any]:
+        # Select the best slots for shifting: max_shift_hours worth of them
+        # (3 h is 3 hourly slots or 12 quarter-hourly ones)
+        n_slots = min(slots_for_hours(max_shift_hours, slots_per_day(prices)), len(prices))
+        chosen = order[:n_slots]
+        selected_hours = [prices[i] for i in chosen]
+
+        # Distribute load evenly across selected slots
+        kwh_per_hour = kwh_flexible / n_slots
 
         schedule = []
         optimized_cost = 0
@@ -58,11 +110,20 @@ class LoadOptimizer:
         savings = baseline_cost - optimized_cost
         savings_percent = (savings / baseline_cost * 100) if baseline_cost > 0 else 0
 
-        return {
+        result = {
             'baseline_cost_eur': round(baseline_cost, 2),
             'optimized_cost_eur': round(optimized_cost, 2),
             'savings_eur': round(savings, 2),
             'savings_percent': round(savings_percent, 1),
             'schedule': schedule,
-            'price_curve': prices
+            'price_curve': prices,
+            'objective': objective
         }
+
+        # Report emissions whenever carbon intensity is known for the day
+        intensity = objective_scores.raw(zone_eic, date_str, "carbon", len(prices))
+        if intensity is not None:
+            result['baseline_co2_kg'] = round(kwh_flexible * float(intensity.mean()) / 1000, 3)
+            result['optimized_co2_kg'] = round(kwh_per_hour * float(intensity[chosen].sum()) / 1000, 3)
+
+        return result
@@ -0,0 +1,43 @@
+from typing import Dict, List, Tuple
+from app.services.forecaster import forecaster
+from app.services.objectives import objective_scores
+from app.db.storage import storage
+
+
+async def resolve_prices(zone_eic: str, date_str: str) -> Tuple[List[Dict], bool]:
+    """Stored prices, else a fresh ENTSO-E fetch, else a provisional forecast"""
+    prices = storage.get_prices(zone_eic, date_str)
+    if prices:
+        return prices, False
+
+    # Try to fetch if not available
+    from app.services.entsoe_client import EntsoeClient
+    client = EntsoeClient()
+    prices = await client.fetch_day_ahead_prices(zone_eic, date_str)
+    if prices:
+        storage.save_prices(zone_eic, date_str, prices)
+        return prices, False
+
+    # Not published yet: plan on a provisional curve. Forecasts are never
+    # stored, so the next request picks up real prices once they land.
+    forecast = forecaster.forecast(zone_eic, date_str)
+    if not forecast:
+        raise ValueError("No price data available")
+    return forecast['prices'], True
+
+
+async def ensure_signals(zone_eic: str, date_str: str, weights: Dict[str, float]):
+    """Fetch carbon/peak inputs only if ingest has not already cached them"""
+    missing = objective_scores.missing(zone_eic, date_str, weights)
+    if not missing:
+        return
+    from app.services.entsoe_client import EntsoeClient
+    client = EntsoeClient()
+    if "carbon" in missing:
+        generation = await client.fetch_generation_per_type(zone_eic, date_str)
+        if generation:
+            storage.save_generation(zone_eic, date_str, generation)
+    if "peak" in missing:
+        loads = await client.fetch_actual_load(zone_eic, date_str)
+        if loads:
+            storage.save_load(zone_eic, date_str, loads)
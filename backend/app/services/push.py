@@ -0,0 +1,175 @@
+import asyncio
+import itertools
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from app.config import settings
+from app.db.storage import DataStorage, storage
+from app.models.optimization import OptimizeResponse, ScheduleUpdate
+from app.services.optimizer import LoadOptimizer
+
+
+class Subscriber:
+    """
+    One open stream. Holds only the latest undelivered payload per date, so a
+    slow client is conflated rather than queued: memory per connection stays
+    bounded no matter how many curves arrive while it is not reading.
+    """
+
+    __slots__ = ("id", "zone_eic", "date_utc", "job", "pending", "wakeup", "dropped")
+
+    MAX_PENDING_DATES = 8
+
+    def __init__(self, sub_id: int, zone_eic: str, date_utc: Optional[str], job: Tuple[float, int]):
+        self.id = sub_id
+        self.zone_eic = zone_eic
+        self.date_utc = date_utc
+        self.job = job
+        self.pending: "OrderedDict[str, bytes]" = OrderedDict()
+        self.wakeup = asyncio.Event()
+        self.dropped = 0
+
+    def offer(self, date_str: str, payload: bytes):
+        if date_str in self.pending:
+            self.dropped += 1  # replaced by a newer curve for the same date
+            del self.pending[date_str]
+        self.pending[date_str] = payload
+        while len(self.pending) > self.MAX_PENDING_DATES:
+            self.pending.popitem(last=False)
+            self.dropped += 1
+        self.wakeup.set()
+
+
+class ScheduleBroadcaster:
+    """
+    Pushes re-optimized load-shift schedules when new prices are stored.
+
+    On each price save for a zone, every distinct (kwh_flexible,
+    max_shift_hours) among that zone's subscribers is solved once with
+    LoadOptimizer.optimize_many and serialized once; subscribers only receive
+    a reference to the shared payload bytes.
+    """
+
+    def __init__(self, store: DataStorage, max_subscribers: int = 10000, heartbeat_s: float = 15.0):
+        self.storage = store
+        self.max_subscribers = max_subscribers
+        self.heartbeat_s = heartbeat_s
+        self.optimizer = LoadOptimizer()
+        self.zones: Dict[str, Dict[int, Subscriber]] = {}
+        self._ids = itertools.count(1)
+        self.count = 0
+
+    # ---------- registration ----------
+    def subscribe(
+            self,
+            zone_eic: str,
+            kwh_flexible: float,
+            max_shift_hours: int,
+            date_utc: Optional[str] = None
+    ) -> Subscriber:
+        if self.full():
+            raise OverflowError("Subscriber limit reached for this worker")
+        sub = Subscriber(next(self._ids), zone_eic, date_utc, (kwh_flexible, max_shift_hours))
+        self.zones.setdefault(zone_eic, {})[sub.id] = sub
+        self.count += 1
+
+        # Prices already stored for the requested date: deliver right away
+        if date_utc:
+            prices = self.storage.get_prices(zone_eic, date_utc)
+            if prices:
+                try:
+                    self._broadcast(zone_eic, date_utc, prices, [sub])
+                except Exception:
+                    self.unsubscribe(sub)
+                    raise
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        zone_subs = self.zones.get(sub.zone_eic)
+        if zone_subs and zone_subs.pop(sub.id, None) is not None:
+            self.count -= 1
+            if not zone_subs:
+                del self.zones[sub.zone_eic]
+
+    # ---------- fan-out ----------
+    def on_storage_update(self, kind: str, zone_eic: str, date_str: str, records: List[Dict]):
+        """Storage listener; the batch runs on the next loop iteration so the saving request is not delayed"""
+        if kind != "prices" or zone_eic not in self.zones:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._broadcast(zone_eic, date_str, records)
+            return
+        loop.call_soon(self._broadcast, zone_eic, date_str, records)
+
+    def _broadcast(
+            self,
+            zone_eic: str,
+            date_str: str,
+            prices: List[Dict],
+            targets: Optional[List[Subscriber]] = None
+    ):
+        if targets is None:
+            targets = [
+                s for s in self.zones.get(zone_eic, {}).values()
+                if s.date_utc is None or s.date_utc == date_str
+            ]
+        if not targets:
+            return
+
+        self.optimizer.set_price_data(zone_eic, date_str, prices)
+        jobs = sorted({s.job for s in targets})
+        try:
+            results = self.optimizer.optimize_many(zone_eic, date_str, jobs)
+        finally:
+            # The curve lives in storage; don't keep a second copy per pushed date
+            self.optimizer.price_data.pop(f"{zone_eic}_{date_str}", None)
+
+        payloads = {}
+        for (kwh, hours), result in zip(jobs, results):
+            update = ScheduleUpdate(
+                zone_eic=zone_eic,
+                date_utc=date_str,
+                kwh_flexible=kwh,
+                max_shift_hours=hours,
+                result=OptimizeResponse(**{**result, 'price_curve': None})
+            )
+            payloads[(kwh, hours)] = f"event: schedule\ndata: {update.model_dump_json()}\n\n".encode()
+        for sub in targets:
+            sub.offer(date_str, payloads[sub.job])
+
+    # ---------- streaming ----------
+    def full(self) -> bool:
+        return self.count >= self.max_subscribers
+
+    async def stream(self, sub: Subscriber) -> AsyncIterator[bytes]:
+        """
+        Server-sent events for a subscriber registered with subscribe(). The
+        slot is taken before the response starts, so a full worker can still
+        answer 503; the finally block always gives it back. Heartbeats let
+        proxies and dead-peer detection see traffic on idle streams.
+        """
+        try:
+            yield f"event: subscribed\ndata: {{\"subscriber_id\": {sub.id}}}\n\n".encode()
+            while True:
+                if not sub.pending:
+                    try:
+                        await asyncio.wait_for(sub.wakeup.wait(), timeout=self.heartbeat_s)
+                    except asyncio.TimeoutError:
+                        yield b": ping\n\n"
+                        continue
+                sub.wakeup.clear()
+                while sub.pending:
+                    _, payload = sub.pending.popitem(last=False)
+                    yield payload
+        finally:
+            self.unsubscribe(sub)
+
+
+# Global broadcaster, fed by every price save to the global storage
+broadcaster = ScheduleBroadcaster(
+    storage,
+    max_subscribers=settings.push_max_subscribers,
+    heartbeat_s=settings.push_heartbeat_seconds
+)
+storage.subscribe(broadcaster.on_storage_update)
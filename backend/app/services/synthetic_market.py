@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+import zlib
+import numpy as np
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Vectorized SplitMix64 finalizer: uint64 counters -> well-mixed uint64"""
+    with np.errstate(over="ignore"):
+        z = (x + np.uint64(0x9E3779B97F4A7C15)) & _MASK64
+        z = ((z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK64
+        z = ((z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK64
+        return z ^ (z >> np.uint64(31))
+
+
+def _uniform(key: int, counters: np.ndarray) -> np.ndarray:
+    """Counter-based uniforms in [0, 1): the value for a slot never depends on the window it is generated in"""
+    with np.errstate(over="ignore"):
+        mixed = _splitmix64(counters.astype(np.uint64) ^ _splitmix64(np.array([key], dtype=np.uint64)))
+    return (mixed >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _normal(key: int, counters: np.ndarray) -> np.ndarray:
+    """Box-Muller on two independent counter streams"""
+    u1 = _uniform(key, counters)
+    u2 = _uniform(key ^ 0x5DEECE66D, counters)
+    return np.sqrt(-2.0 * np.log1p(-u1)) * np.cos(2 * np.pi * u2)
+
+
+class SyntheticMarket:
+    """
+    Deterministic, numpy-vectorized generator of day-ahead prices and total load.
+
+    Curves combine a seasonal (annual), weekly and intraday shape with noise,
+    plus occasional negative-price events around solar noon. Every value is a
+    pure function of (seed, zone, slot), so one day generated alone is
+    identical to the same day inside a multi-year batch.
+    """
+
+    def __init__(
+            self,
+            seed: int = 42,
+            resolution_minutes: int = 60,
+            base_price_eur_mwh: float = 80.0,
+            base_load_mw: float = 12000.0,
+            negative_event_rate: float = 0.04,
+    ):
+        if resolution_minutes <= 0 or 1440 % resolution_minutes:
+            raise ValueError("resolution_minutes must divide a day evenly")
+        self.seed = seed
+        self.resolution_minutes = resolution_minutes
+        self.slots_per_day = 1440 // resolution_minutes
+        self.base_price = base_price_eur_mwh
+        self.base_load = base_load_mw
+        self.negative_event_rate = negative_event_rate
+
+    # ---------- grid ----------
+    def _key(self, zone_eic: str, stream: int) -> int:
+        return (self.seed * 1_000_003 + zlib.crc32(zone_eic.encode()) * 31 + stream) & 0xFFFFFFFFFFFFFFFF
+
+    def _grid(self, start: datetime, days: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return (epoch day, day-of-year, weekday, hour-of-day) broadcastable to days x slots"""
+        first_day = (self._as_utc(start) - EPOCH).days
+        day = np.arange(first_day, first_day + days, dtype=np.int64)[:, None]
+        doy = day % 365.2425  # 1970-01-01 is day-of-year 0; drift is negligible for a seasonal phase
+        weekday = (day + 3) % 7  # 1970-01-01 was a Thursday; 0 == Monday
+        hour = (np.arange(self.slots_per_day) * self.resolution_minutes / 60.0)[None, :]
+        return day, doy, weekday, hour
+
+    @staticmethod
+    def _as_utc(ts: datetime) -> datetime:
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return ts.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def _counters(self, day: np.ndarray) -> np.ndarray:
+        return day * self.slots_per_day + np.arange(self.slots_per_day)[None, :]
+
+    # ---------- shapes ----------
+    @staticmethod
+    def _winter(doy: np.ndarray) -> np.ndarray:
+        """+1 mid-January, -1 mid-July"""
+        return np.cos(2 * np.pi * (doy - 15) / 365.2425)
+
+    @staticmethod
+    def _solar(hour: np.ndarray, doy: np.ndarray) -> np.ndarray:
+        """Clear-sky PV proxy in [0, 1], stronger and wider in summer"""
+        summer = 0.5 * (1 - SyntheticMarket._winter(doy))
+        half_width = 4.0 + 3.0 * summer
+        return np.clip(np.cos(np.pi / 2 * (hour - 12.5) / half_width), 0, None) * (0.3 + 0.7 * summer)
+
+    @staticmethod
+    def _peaks(hour: np.ndarray) -> np.ndarray:
+        return np.exp(-((hour - 8) ** 2) / 6) * 0.35 + np.exp(-((hour - 19) ** 2) / 5) * 0.5
+
+    # ---------- public API ----------
+    def prices(self, zone_eic: str, start: datetime, days: int = 1) -> np.ndarray:
+        """Day-ahead prices in EUR/MWh, shape (days, slots_per_day)"""
+        day, doy, weekday, hour = self._grid(start, days)
+        weekend = weekday >= 5
+        seasonal = 1 + 0.2 * self._winter(doy)
+        weekly = np.where(weekend, 0.85, 1.0)
+        intraday = 0.75 + self._peaks(hour)
+        solar = self._solar(hour, doy)
+
+        price = self.base_price * seasonal * weekly * (intraday - 0.35 * solar)
+        price = price * (1 + 0.08 * _normal(self._key(zone_eic, 1), self._counters(day)))
+
+        # Negative-price events: whole days of midday oversupply, likelier on sunny weekends
+        event_p = self.negative_event_rate * (0.3 + 1.4 * (1 - self._winter(doy)) / 2) * np.where(weekend, 2.0, 1.0)
+        event = _uniform(self._key(zone_eic, 2), day) < event_p
+        depth = 40 + 80 * _uniform(self._key(zone_eic, 3), day)
+        price = price - event * depth * (solar > 0.5) * solar
+
+        return np.round(price, 2)
+
+    def loads(self, zone_eic: str, start: datetime, days: int = 1) -> np.ndarray:
+        """Actual total load in MW, shape (days, slots_per_day)"""
+        day, doy, weekday, hour = self._grid(start, days)
+        seasonal = 1 + 0.12 * self._winter(doy)
+        weekly = np.where(weekday >= 5, 0.88, 1.0)
+        intraday = 0.7 + self._peaks(hour) * 0.8 + 0.1 * (np.abs(hour - 13) < 5)
+        load = self.base_load * seasonal * weekly * intraday
+        load = load * (1 + 0.02 * _normal(self._key(zone_eic, 4), self._counters(day)))
+        return np.round(load, 2)
+
+    def generation(self, zone_eic: str, start: datetime, days: int = 1) -> Dict[str, np.ndarray]:
+        """Generation per ENTSO-E production type in MW, each (days, slots_per_day), summing to load"""
+        day, doy, weekday, hour = self._grid(start, days)
+        load = self.loads(zone_eic, start, days)
+        counters = self._counters(day)
+
+        nuclear = np.full_like(load, 0.12 * self.base_load)
+        hydro = np.full_like(load, 0.03 * self.base_load)
+        cloud = 0.6 + 0.4 * _uniform(self._key(zone_eic, 5), day)
+        solar = 0.45 * self.base_load * self._solar(hour, doy) * cloud
+        # Wind: a daily level plus slow intraday drift, stronger in winter
+        wind_level = 0.05 + 0.35 * _uniform(self._key(zone_eic, 6), day) * (1 + 0.3 * self._winter(doy))
+        wind = self.base_load * np.clip(wind_level * (1 + 0.1 * _normal(self._key(zone_eic, 7), counters)), 0, None)
+
+        residual = np.clip(load - nuclear - hydro - solar - wind, 0, None)
+        return {
+            'B14': np.round(nuclear, 1),
+            'B11': np.round(hydro, 1),
+            'B16': np.round(solar, 1),
+            'B19': np.round(wind, 1),
+            'B04': np.round(0.75 * residual, 1),
+            'B05': np.round(0.25 * residual, 1),
+        }
+
+    def timestamps(self, start: datetime, days: int = 1) -> List[datetime]:
+        """UTC slot start times, flattened day by day"""
+        first = self._as_utc(start)
+        step = timedelta(minutes=self.resolution_minutes)
+        return [first + step * i for i in range(days * self.slots_per_day)]
+
+    def price_records(self, zone_eic: str, start: datetime, days: int = 1) -> List[Dict]:
+        """Prices in the same record format as parse_day_ahead_prices"""
+        values = self.prices(zone_eic, start, days).ravel().tolist()
+        return [
+            {'hour_utc': ts, 'price_eur_mwh': v, 'price_eur_kwh': round(v / 1000, 5)}
+            for ts, v in zip(self.timestamps(start, days), values)
+        ]
+
+    def load_records(self, zone_eic: str, start: datetime, days: int = 1) -> List[Dict]:
+        """Loads in the same record format as parse_actual_load"""
+        values = self.loads(zone_eic, start, days).ravel().tolist()
+        return [{'hour_utc': ts, 'load_mw': v} for ts, v in zip(self.timestamps(start, days), values)]
+
+    def generation_records(self, zone_eic: str, start: datetime, days: int = 1) -> List[Dict]:
+        """Generation in the same record format as parse_generation_per_type"""
+        timestamps = self.timestamps(start, days)
+        records = []
+        for psr_type, values in self.generation(zone_eic, start, days).items():
+            records.extend(
+                {'hour_utc': ts, 'psr_type': psr_type, 'generation_mw': v}
+                for ts, v in zip(timestamps, values.ravel().tolist())
+            )
+        return records
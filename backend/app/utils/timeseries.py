@@ -0,0 +1,40 @@
+from typing import Dict, List, Optional
+import numpy as np
+
+
+def resample(values: np.ndarray, slots: int) -> np.ndarray:
+    """Bring a daily curve to `slots` points (hourly <-> quarter-hourly)"""
+    if len(values) == slots:
+        return values
+    if len(values) < slots and slots % len(values) == 0:
+        return np.repeat(values, slots // len(values))
+    if len(values) > slots and len(values) % slots == 0:
+        return values.reshape(slots, -1).mean(axis=1)
+    return np.interp(np.linspace(0, 1, slots, endpoint=False), np.linspace(0, 1, len(values), endpoint=False), values)
+
+
+def min_max(values: np.ndarray) -> np.ndarray:
+    """Scale to [0, 1]; a flat curve maps to zeros"""
+    low, high = values.min(), values.max()
+    if high - low <= 0:
+        return np.zeros_like(values, dtype=np.float64)
+    return (values - low) / (high - low)
+
+
+def slots_per_day(records: List[Dict]) -> int:
+    """Full-day slot count implied by the spacing of `hour_utc` (24 when it cannot be told)"""
+    if len(records) < 2:
+        return 24
+    step = (records[1]['hour_utc'] - records[0]['hour_utc']).total_seconds()
+    return int(round(86400 / step)) if step > 0 else 24
+
+
+def slots_for_hours(hours: float, slots_per_day: int, max_slots: Optional[int] = None) -> int:
+    """
+    Slots covering `hours` at a given resolution: 3 h is 3 hourly slots or 12
+    quarter-hourly ones. The one rule every load-shift path uses for
+    max_shift_hours; capped at one day unless `max_slots` allows more
+    (multi-day horizons).
+    """
+    limit = slots_per_day if max_slots is None else max_slots
+    return int(min(max(round(hours * slots_per_day / 24), 1), limit))
@@ -3,6 +3,19 @@ from typing import Dict, List, Any
 from datetime import datetime, timedelta
 import pandas as pd
 
+# ISO-8601 durations used by the transparency platform for Period/resolution
+RESOLUTIONS = {
+    'PT15M': timedelta(minutes=15),
+    'PT30M': timedelta(minutes=30),
+    'PT60M': timedelta(hours=1),
+    'P1D': timedelta(days=1),
+}
+
+
+def _resolution(period: Dict[str, Any]) -> timedelta:
+    """Step between consecutive points of a Period (defaults to hourly)"""
+    return RESOLUTIONS.get(period.get('resolution', 'PT60M'), timedelta(hours=1))
+
 
 def parse_day_ahead_prices(xml_content: str) -> List[Dict[str, Any]]:
     """Parse ENTSO-E day-ahead price XML response"""
@@ -22,11 +35,12 @@ def parse_day_ahead_prices(xml_content: str) -> List[Dict[str, Any]]:
                 points = [points]
 
             start_time = datetime.fromisoformat(period.get('timeInterval', {}).get('start', '').replace('Z', '+00:00'))
+            step = _resolution(period)
 
             for point in points:
                 position = int(point.get('position', 0))
                 price = float(point.get('price.amount', 0))
-                hour_time = start_time + timedelta(hours=position - 1)
+                hour_time = start_time + step * (position - 1)
 
                 prices.append({
                     'hour_utc': hour_time,
@@ -57,11 +71,12 @@ def parse_actual_load(xml_content: str) -> List[Dict[str, Any]]:
                 points = [points]
 
             start_time = datetime.fromisoformat(period.get('timeInterval', {}).get('start', '').replace('Z', '+00:00'))
+            step = _resolution(period)
 
             for point in points:
                 position = int(point.get('position', 0))
                 quantity = float(point.get('quantity', 0))
-                hour_time = start_time + timedelta(hours=position - 1)
+                hour_time = start_time + step * (position - 1)
 
                 loads.append({
                     'hour_utc': hour_time,
@@ -72,3 +87,45 @@ def parse_actual_load(xml_content: str) -> List[Dict[str, Any]]:
     except Exception as e:
         print(f"Error parsing load XML: {e}")
         return []
+
+
+def parse_generation_per_type(xml_content: str) -> List[Dict[str, Any]]:
+    """Parse ENTSO-E actual generation per production type (A75) XML response"""
+    try:
+        data = xmltodict.parse(xml_content)
+
+        time_series = data.get('GL_MarketDocument', {}).get('TimeSeries', [])
+        if not isinstance(time_series, list):
+            time_series = [time_series]
+
+        generation = []
+        for ts in time_series:
+            # Series with an outBiddingZone are consumption (e.g. pumped storage), not generation
+            if 'outBiddingZone_Domain.mRID' in ts:
+                continue
+            psr_type = ts.get('MktPSRType', {}).get('psrType', '')
+
+            periods = ts.get('Period', [])
+            if not isinstance(periods, list):
+                periods = [periods]
+
+            for period in periods:
+                points = period.get('Point', [])
+                if not isinstance(points, list):
+                    points = [points]
+
+                start_time = datetime.fromisoformat(period.get('timeInterval', {}).get('start', '').replace('Z', '+00:00'))
+                step = _resolution(period)
+
+                for point in points:
+                    position = int(point.get('position', 0))
+                    generation.append({
+                        'hour_utc': start_time + step * (position - 1),
+                        'psr_type': psr_type,
+                        'generation_mw': float(point.get('quantity', 0))
+                    })
+
+        return generation
+    except Exception as e:
+        print(f"Error parsing generation XML: {e}")
+        return []
@@ -0,0 +1,232 @@
+"""
+In-process latency benchmark for /agent/advise.
+
+Compares the previous sequential pipeline (optimize, then a blocking
+preference lookup, then the LLM call, then both memory writes before the
+response) with the current one (optimization and the cached preference lookup
+run concurrently, Chroma off the event loop, writes in background tasks).
+
+Prices come from the synthetic market and Chroma runs in a temporary
+directory with a hashing embedder, so no network or API key is needed. The
+LLM is simulated with a fixed latency (--llm-ms); the legacy path calls it
+synchronously like the old agent did. Latency is measured from submission,
+so it includes the time a request queues behind others (see _drive).
+
+Usage:
+    python -m scripts.bench_advise --requests 400 --concurrency 16 --rate 100 --llm-ms 50
+    python -m scripts.bench_advise --users 20 --context-every 5 --json advise.json
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from chromadb import EmbeddingFunction
+from fastapi import BackgroundTasks
+
+from app.api import agent as agent_api
+from app.db.memory import MemoryStore
+from app.db.storage import storage
+from app.models.optimization import AgentAdviseRequest, AgentAdviseResponse
+from app.services.entsoe_client import synthetic_market
+from scripts.loadtest import percentile
+
+ZONE = "10YNL----------L"
+DAY = "2024-06-01"
+
+
+class HashEmbedding(EmbeddingFunction):
+    """Deterministic 32-d embedding; avoids downloading Chroma's default model"""
+
+    def __init__(self):
+        pass
+
+    def __call__(self, input):
+        return [[b / 255 for b in hashlib.sha256(doc.encode()).digest()] for doc in input]
+
+    @staticmethod
+    def name() -> str:
+        return "bench-hash"
+
+    def get_config(self) -> Dict:
+        return {}
+
+    @staticmethod
+    def build_from_config(config: Dict) -> "HashEmbedding":
+        return HashEmbedding()
+
+
+class _Reply:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class SimulatedLLM:
+    """Fixed-latency chat model: invoke blocks (old agent), ainvoke yields"""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.text = "Run the load overnight because prices are lowest based on the day-ahead curve."
+
+    def invoke(self, messages):
+        time.sleep(self.latency_s)
+        return _Reply(self.text)
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.latency_s)
+        return _Reply(self.text)
+
+
+async def legacy_advise(request: AgentAdviseRequest, store: MemoryStore, llm: SimulatedLLM) -> AgentAdviseResponse:
+    """The pre-pipeline handler, stage by stage (with price data set so it can succeed)"""
+    optimizer = agent_api.optimizer
+    optimizer.set_price_data(request.zone_eic, request.date_utc, storage.get_prices(request.zone_eic, request.date_utc))
+    opt_result = optimizer.optimize(request.zone_eic, request.date_utc, request.kwh_flexible, 3, "min_cost")
+
+    res = store.collection.get(where={"user_id": request.user_id}, limit=5, include=["documents"])
+    user_prefs = res.get("documents") or []
+    reply = llm.invoke([f"{opt_result['savings_eur']} {user_prefs} {request.context}"])
+    advice = {
+        'advice': reply.content[:200],
+        'reasoning': agent_api.agent._extract_reasoning(reply.content),
+        'plan': {
+            'savings': opt_result['savings_eur'],
+            'best_hours': [str(s.hour_utc) for s in opt_result['schedule'][:3]],
+            'action': 'shift_load'
+        },
+        'confidence': 0.85
+    }
+
+    if request.context:
+        store.collection.add(
+            documents=[request.context],
+            metadatas=[{"user_id": request.user_id, "timestamp": "", "type": "preference"}],
+            ids=[f"legacy-{time.perf_counter_ns()}"],
+        )
+    store.collection.add(
+        documents=[f"User {request.user_id} saved €{opt_result['savings_eur']}"],
+        metadatas=[{"user_id": request.user_id, "type": "optimization_run", "data": "{}"}],
+        ids=[f"legacy-run-{time.perf_counter_ns()}"],
+    )
+    return AgentAdviseResponse(**advice)
+
+
+async def pipeline_advise(request: AgentAdviseRequest) -> Tuple[AgentAdviseResponse, BackgroundTasks]:
+    """Current handler; the caller runs the background tasks after the response"""
+    background = BackgroundTasks()
+    response = await agent_api.get_agent_advice(request, background)
+    return response, background
+
+
+def _requests(args) -> List[AgentAdviseRequest]:
+    return [
+        AgentAdviseRequest(
+            user_id=f"bench-{i % args.users}",
+            zone_eic=ZONE,
+            date_utc=DAY,
+            kwh_flexible=6.0,
+            context="prefers overnight charging" if args.context_every and i % args.context_every == 0 else None
+        )
+        for i in range(args.requests)
+    ]
+
+
+async def _drive(name: str, requests: List[AgentAdviseRequest], concurrency: int, rate: float, call) -> Dict:
+    """
+    Client-visible latency under a fixed arrival schedule: request i arrives
+    i / rate seconds after the start (all at once when rate is 0) and its
+    timer starts at that arrival time, before it waits for one of the
+    `concurrency` slots. A handler that blocks the event loop therefore shows
+    the queueing it causes, not only its own service time.
+
+    Background tasks run as FastAPI runs them, right after their response and
+    while later requests are served, so preference writes invalidate the cache
+    and compete with reads inside the timed window.
+    """
+    gate = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    started = time.perf_counter()
+
+    async def one(i: int, request: AgentAdviseRequest):
+        arrival = started + (i / rate if rate > 0 else 0.0)
+        await asyncio.sleep(max(arrival - time.perf_counter(), 0.0))
+        async with gate:
+            result = await call(request)
+            latencies.append(time.perf_counter() - arrival)
+        if isinstance(result, tuple):
+            await result[1]()
+
+    await asyncio.gather(*(one(i, r) for i, r in enumerate(requests)))
+    elapsed = time.perf_counter() - started
+
+    lat = sorted(latencies)
+    return {
+        "pipeline": name,
+        "requests": len(lat),
+        "rps": round(len(lat) / elapsed, 1),
+        "p50_ms": round(percentile(lat, 50) * 1000, 2),
+        "p95_ms": round(percentile(lat, 95) * 1000, 2),
+        "p99_ms": round(percentile(lat, 99) * 1000, 2),
+    }
+
+
+async def run(args) -> List[Dict]:
+    workdir = tempfile.mkdtemp(prefix="bench-advise-")
+    try:
+        start = datetime.strptime(DAY, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        storage.save_prices(ZONE, DAY, synthetic_market.price_records(ZONE, start))
+
+        llm = SimulatedLLM(args.llm_ms / 1000)
+        store = MemoryStore(path=workdir, cache_size=args.users * 2, embedding_function=HashEmbedding())
+        for u in range(args.users):
+            await store.save_preference(f"bench-{u}", "ev: charge before 07:00")
+        agent_api.memory = store
+        agent_api.agent.memory_store = store
+        agent_api.agent.llm = llm
+
+        requests = _requests(args)
+        results = [
+            await _drive("legacy", requests, args.concurrency, args.rate, lambda r: legacy_advise(r, store, llm)),
+            await _drive("pipeline", requests, args.concurrency, args.rate, pipeline_advise),
+        ]
+        results[1]["prefs_cache_hit_rate"] = round(
+            store.cache_hits / max(store.cache_hits + store.cache_misses, 1), 3
+        )
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the /agent/advise pipeline in-process")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=100.0,
+                        help="arrivals per second (fixed schedule); 0 submits every request at once")
+    parser.add_argument("--users", type=int, default=50, help="distinct user ids (cache working set)")
+    parser.add_argument("--context-every", type=int, default=10,
+                        help="every Nth request carries context (a preference write); 0 for none")
+    parser.add_argument("--llm-ms", type=float, default=50.0, help="simulated LLM latency")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"{'pipeline':<10} {'reqs':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for r in results:
+        print(f"{r['pipeline']:<10} {r['requests']:>6} {r['rps']:>8} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9}")
+    legacy, current = results
+    if current["p50_ms"] > 0:
+        print(f"p50 speedup: {legacy['p50_ms'] / current['p50_ms']:.2f}x, "
+              f"prefs cache hit rate: {current['prefs_cache_hit_rate']:.1%}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,500 @@
+"""
+Reproducible micro and endpoint benchmarks for the backend hot paths.
+
+Components:
+- parser:    parse_day_ahead_prices on A44 documents of 1 day to 1 year at PT15M and PT60M
+- storage:   DataStorage save/get and the price-matrix view, with and without the app's listeners
+- optimizer: LoadOptimizer.optimize called per job and optimize_many, 1 to 10k jobs
+- api:       in-process ASGI requests against app.main (no server, no network):
+             ingest in mock mode, load-shift, storage, multi-zone, forecast,
+             backtest and /agent/advise with a stub LLM and a temporary Chroma store
+             (timed to the response; its background writes are a separate case)
+
+Each case reports latency percentiles per call, throughput (items per second:
+XML points, records, jobs or requests) and the tracemalloc peak of one
+extra, untimed call (for api, one untimed wave of --concurrency requests). Fixtures come from scripts.fake_entsoe and the
+synthetic market with fixed seeds, so runs on the same machine compare.
+
+Usage:
+    python -m scripts.benchmark --json bench.json
+    python -m scripts.benchmark --quick --components parser,optimizer
+    python -m scripts.benchmark --json new.json --compare bench.json --tolerance 0.15
+"""
+import argparse
+import asyncio
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.db.storage import DataStorage
+from app.services.optimizer import LoadOptimizer
+from app.services.synthetic_market import SyntheticMarket
+from app.utils.xml_parser import parse_day_ahead_prices
+from scripts.fake_entsoe import FakeEntsoeConfig, render_prices
+from scripts.loadtest import percentile
+
+ZONE = "10YNL----------L"
+API_ZONES = ["10YNL----------L", "10YBE----------2", "10Y1001A1001A82H", "10YFR-RTE------C"]
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SEED = 7
+
+COMPONENTS = ["parser", "storage", "optimizer", "api"]
+SIZES = {
+    "full": {"days": [1, 7, 30, 365], "jobs": [1, 100, 1000, 10000], "requests": 200},
+    "quick": {"days": [1, 7, 30], "jobs": [1, 100, 1000], "requests": 50},
+}
+
+
+def _dates(days: int, start: datetime = START) -> List[str]:
+    return [(start + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(days)]
+
+
+def _summary(
+        component: str,
+        case: str,
+        params: Dict[str, Any],
+        latencies: List[float],
+        items_per_run: int,
+        elapsed: float,
+        peak_bytes: int
+) -> Dict[str, Any]:
+    lat = sorted(latencies)
+    return {
+        "component": component,
+        "case": case,
+        "params": params,
+        "runs": len(lat),
+        "items_per_run": items_per_run,
+        "p50_ms": round(percentile(lat, 50) * 1000, 4),
+        "p95_ms": round(percentile(lat, 95) * 1000, 4),
+        "p99_ms": round(percentile(lat, 99) * 1000, 4),
+        "mean_ms": round(sum(lat) / len(lat) * 1000, 4),
+        "throughput_per_s": round(items_per_run * len(lat) / max(elapsed, 1e-12), 1),
+        "peak_kib": round(peak_bytes / 1024, 1),
+    }
+
+
+def measure(
+        component: str,
+        case: str,
+        params: Dict[str, Any],
+        fn: Callable[[], Any],
+        items_per_run: int,
+        repeat: int,
+        budget_s: float,
+        setup: Optional[Callable[[], None]] = None
+) -> Dict[str, Any]:
+    """
+    Time `fn` up to `repeat` times (at least 3, stopping early once `budget_s`
+    is spent), then run it once more under tracemalloc for peak memory.
+    `setup` runs untimed before every call.
+    """
+    if setup:
+        setup()
+    fn()  # warm-up: imports, caches, first-touch allocations
+
+    latencies: List[float] = []
+    elapsed = 0.0
+    while len(latencies) < repeat and (len(latencies) < 3 or elapsed < budget_s):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        latencies.append(dt)
+        elapsed += dt
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return _summary(component, case, params, latencies, items_per_run, elapsed, peak)
+
+
+# ---------- parser ----------
+def bench_parser(sizes: Dict, repeat: int, budget_s: float) -> List[Dict]:
+    results = []
+    for resolution in ("PT60M", "PT15M"):
+        config = FakeEntsoeConfig(zones=[ZONE], resolution=resolution, seed=SEED)
+        for days in sizes["days"]:
+            xml = render_prices(config, ZONE, START, START + timedelta(days=days))
+            points = len(parse_day_ahead_prices(xml))
+            results.append(measure(
+                "parser", "parse_day_ahead_prices",
+                {"days": days, "resolution": resolution, "xml_kib": round(len(xml) / 1024, 1)},
+                lambda: parse_day_ahead_prices(xml),
+                points, repeat, budget_s
+            ))
+    return results
+
+
+# ---------- storage ----------
+def bench_storage(sizes: Dict, repeat: int, budget_s: float) -> List[Dict]:
+    results = []
+    for resolution in (60, 15):
+        market = SyntheticMarket(seed=SEED, resolution_minutes=resolution)
+        for days in sizes["days"]:
+            dates = _dates(days)
+            records = market.price_records(ZONE, START, days)
+            slots = len(records) // days
+            per_day = [records[i * slots:(i + 1) * slots] for i in range(days)]
+            params = {"days": days, "resolution_min": resolution}
+            holder = {}
+
+            def fresh():
+                holder["store"] = DataStorage()
+
+            def save_all():
+                store = holder["store"]
+                for d, recs in zip(dates, per_day):
+                    store.save_prices(ZONE, d, recs)
+
+            results.append(measure(
+                "storage", "save_prices", params, save_all, len(records), repeat, budget_s, setup=fresh
+            ))
+
+            filled = DataStorage()
+            for d, recs in zip(dates, per_day):
+                filled.save_prices(ZONE, d, recs)
+
+            def get_all():
+                for d in dates:
+                    filled.get_prices(ZONE, d)
+
+            results.append(measure("storage", "get_prices", params, get_all, len(records), repeat, budget_s))
+            results.append(measure(
+                "storage", "get_price_matrix", params,
+                lambda: filled.get_price_matrix(ZONE, dates),
+                len(records), repeat, budget_s
+            ))
+
+    # The global store notifies the forecaster, objective scores and push broadcaster on every save
+    from app.db.storage import storage as app_storage
+    import app.main  # noqa: F401  (registers every listener)
+    market = SyntheticMarket(seed=SEED, resolution_minutes=15)
+    bench_zone = "10YBENCH-------X"
+    for days in sizes["days"]:
+        dates = _dates(days, START + timedelta(days=400))
+        records = market.price_records(bench_zone, START + timedelta(days=400), days)
+        slots = len(records) // days
+        per_day = [records[i * slots:(i + 1) * slots] for i in range(days)]
+
+        def save_with_listeners():
+            for d, recs in zip(dates, per_day):
+                app_storage.save_prices(bench_zone, d, recs)
+
+        results.append(measure(
+            "storage", "save_prices_with_listeners", {"days": days, "resolution_min": 15},
+            save_with_listeners, len(records), repeat, budget_s
+        ))
+    return results
+
+
+# ---------- optimizer ----------
+def bench_optimizer(sizes: Dict, repeat: int, budget_s: float) -> List[Dict]:
+    results = []
+    date_str = _dates(1)[0]
+    for resolution in (60, 15):
+        prices = SyntheticMarket(seed=SEED, resolution_minutes=resolution).price_records(ZONE, START)
+        optimizer = LoadOptimizer()
+        optimizer.set_price_data(ZONE, date_str, prices)
+        for n_jobs in sizes["jobs"]:
+            # Mixed job sizes, all distinct so optimize_many cannot dedupe its way
+            # past the work and its throughput compares with per-call optimize
+            jobs = [(round(1.0 + i * 0.001, 3), 1 + i % 8) for i in range(n_jobs)]
+            params = {"jobs": n_jobs, "distinct_jobs": len(set(jobs)), "resolution_min": resolution}
+
+            def per_job():
+                for kwh, hours in jobs:
+                    optimizer.optimize(ZONE, date_str, kwh, hours)
+
+            results.append(measure("optimizer", "optimize", params, per_job, n_jobs, repeat, budget_s))
+            results.append(measure(
+                "optimizer", "optimize_many", params,
+                lambda: optimizer.optimize_many(ZONE, date_str, jobs),
+                n_jobs, repeat, budget_s
+            ))
+    return results
+
+
+# ---------- api ----------
+def _api_cases(days: List[str]) -> List[Dict[str, Any]]:
+    forecast_day = (datetime.strptime(days[-1], "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    # Ingest a separate year so it does not overwrite the curves other cases read
+    ingest_days = _dates(30, START + timedelta(days=366))
+    return [
+        {
+            "name": "ingest_entsoe", "method": "POST", "path": "/ingest/entsoe",
+            "body": lambda i: {"zone_eic": API_ZONES[i % len(API_ZONES)], "date_utc": ingest_days[i % len(ingest_days)]},
+        },
+        {
+            # Timed to the response; the post-response writes are reported as agent_advise_background
+            "name": "agent_advise", "method": "POST", "path": "/agent/advise", "background": True,
+            "body": lambda i: {
+                "user_id": f"bench-{i % 50}", "zone_eic": ZONE, "date_utc": days[i % len(days)],
+                "kwh_flexible": 6.0, "context": "prefers overnight charging" if i % 10 == 0 else None
+            },
+        },
+        {
+            "name": "optimize_load_shift", "method": "POST", "path": "/optimize/load-shift",
+            "body": lambda i: {
+                "zone_eic": API_ZONES[i % len(API_ZONES)], "date_utc": days[i % len(days)],
+                "kwh_flexible": 6.0, "max_shift_hours": 3
+            },
+        },
+        {
+            "name": "optimize_storage", "method": "POST", "path": "/optimize/storage",
+            "body": lambda i: {
+                "zone_eic": ZONE, "date_utc": days[i % len(days)],
+                "capacity_kwh": 13.5, "max_charge_kw": 5.0, "max_discharge_kw": 5.0
+            },
+        },
+        {
+            "name": "optimize_multi_zone", "method": "POST", "path": "/optimize/multi-zone",
+            "body": lambda i: {
+                "zones": API_ZONES, "date_utc": days[i % (len(days) - 7)],
+                "horizon_days": 7, "kwh_flexible": 40.0, "max_shift_hours": 12
+            },
+        },
+        {
+            "name": "forecast_prices", "method": "GET", "path": "/forecast/prices",
+            "params": lambda i: {"zone_eic": API_ZONES[i % len(API_ZONES)], "date_utc": forecast_day},
+        },
+        {
+            "name": "backtest_synthetic_year", "method": "POST", "path": "/backtest/load-shift", "scale": 0.25,
+            "body": lambda i: {
+                "zone_eic": ZONE, "start_date": "2023-01-01", "end_date": "2023-12-31", "source": "synthetic"
+            },
+        },
+    ]
+
+
+class _ResponseClock:
+    """
+    ASGI wrapper that notes when each response's last body chunk is sent.
+    ASGITransport only returns once background tasks have finished, so this
+    is what separates client-visible latency from post-response work.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.sent: Dict[str, float] = {}
+
+    async def __call__(self, scope, receive, send):
+        request_id = dict(scope.get("headers", [])).get(b"x-bench-id", b"").decode()
+
+        async def clocked_send(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                self.sent[request_id] = time.perf_counter()
+
+        await self.app(scope, receive, clocked_send)
+
+
+async def _run_api(cases: List[Dict], requests: int, concurrency: int) -> List[Dict]:
+    """
+    Like measure(): latencies come from a run with tracemalloc off and peak
+    memory from a separate wave of `concurrency` requests traced on their own.
+    """
+    import httpx
+    from app.main import app
+
+    results = []
+    clock = _ResponseClock(app)
+    transport = httpx.ASGITransport(app=clock)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for case in cases:
+            n = max(int(requests * case.get("scale", 1.0)), 4)
+
+            async def call(i: int) -> Tuple[float, float]:
+                """Seconds to the response and to the end of its background tasks"""
+                request_id = f"{case['name']}-{i}"
+                t0 = time.perf_counter()
+                response = await client.request(
+                    case["method"], case["path"],
+                    json=case["body"](i) if "body" in case else None,
+                    params=case["params"](i) if "params" in case else None,
+                    headers={"x-bench-id": request_id},
+                )
+                done = time.perf_counter()
+                if response.status_code != 200:
+                    raise RuntimeError(f"{case['path']} returned {response.status_code}: {response.text[:200]}")
+                sent = clock.sent.pop(request_id, done)
+                return sent - t0, done - sent
+
+            gate = asyncio.Semaphore(concurrency)
+
+            async def limited(i: int) -> Tuple[float, float]:
+                async with gate:
+                    return await call(i)
+
+            await call(0)  # warm-up
+            started = time.perf_counter()
+            timings = await asyncio.gather(*(limited(i) for i in range(n)))
+            elapsed = time.perf_counter() - started
+
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            await asyncio.gather(*(limited(n + i) for i in range(min(n, concurrency))))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            params = {"requests": n, "concurrency": concurrency}
+            results.append(_summary("api", case["name"], params, [t[0] for t in timings], 1, elapsed, peak))
+            if case.get("background"):
+                results.append(_summary(
+                    "api", f"{case['name']}_background", params, [t[1] for t in timings], 1, elapsed, peak
+                ))
+    return results
+
+
+def bench_api(sizes: Dict, concurrency: int, llm_ms: float) -> List[Dict]:
+    from app.config import settings
+    from app.db.storage import storage as app_storage
+    from app.api import agent as agent_api
+    from app.db.memory import MemoryStore
+    from scripts.bench_advise import HashEmbedding, SimulatedLLM
+    import app.main  # noqa: F401  (registers every listener before storage is seeded)
+
+    # Ingest runs on the synthetic generator, never the live API or mock files
+    settings.use_mock_data = True
+    settings.mock_source = None
+
+    # Seed 30 days for every zone so no request falls through to ENTSO-E
+    market = SyntheticMarket(seed=SEED, resolution_minutes=60)
+    days = _dates(30)
+    for zone in API_ZONES:
+        records = market.price_records(zone, START, len(days))
+        for d, day in enumerate(days):
+            app_storage.save_prices(zone, day, records[d * 24:(d + 1) * 24])
+
+    # Advise against a throwaway Chroma store and a fixed-latency LLM stub
+    workdir = tempfile.mkdtemp(prefix="benchmark-chroma-")
+    try:
+        store = MemoryStore(path=workdir, embedding_function=HashEmbedding())
+        agent_api.memory = store
+        agent_api.agent.memory_store = store
+        agent_api.agent.llm = SimulatedLLM(llm_ms / 1000)
+        return asyncio.run(_run_api(_api_cases(days), sizes["requests"], concurrency))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ---------- compare ----------
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[Dict]:
+    """Per-case ratios against a baseline run; a ratio above 1 + tolerance is a regression"""
+    def key(r):
+        return r["component"], r["case"], json.dumps(r["params"], sort_keys=True)
+
+    base = {key(r): r for r in baseline}
+    rows = []
+    for r in results:
+        b = base.get(key(r))
+        if b is None:
+            continue
+        p50_ratio = r["p50_ms"] / b["p50_ms"] if b["p50_ms"] else 1.0
+        peak_ratio = r["peak_kib"] / b["peak_kib"] if b["peak_kib"] else 1.0
+        rows.append({
+            "component": r["component"],
+            "case": r["case"],
+            "params": r["params"],
+            "p50_ratio": round(p50_ratio, 3),
+            "peak_ratio": round(peak_ratio, 3),
+            "regression": p50_ratio > 1 + tolerance or peak_ratio > 1 + tolerance,
+        })
+    return rows
+
+
+def _label(r: Dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in r["params"].items() if k != "xml_kib")
+    return f"{r['component']}/{r['case']}[{params}]"
+
+
+def print_table(results: List[Dict]):
+    header = f"{'case':<64}{'p50 ms':>11}{'p95 ms':>11}{'items/s':>14}{'peak KiB':>11}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{_label(r):<64}{r['p50_ms']:>11}{r['p95_ms']:>11}{r['throughput_per_s']:>14}{r['peak_kib']:>11}")
+
+
+def print_comparison(rows: List[Dict]):
+    header = f"{'case':<64}{'p50 x':>9}{'peak x':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(f"{_label(r):<64}{r['p50_ratio']:>9}{r['peak_ratio']:>9}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser, storage, optimizer and API hot paths")
+    parser.add_argument("--components", default=",".join(COMPONENTS), help=f"Any of {','.join(COMPONENTS)}")
+    parser.add_argument("--quick", action="store_true", help="Smaller fixtures (up to 30 days, 1k jobs)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per case (at least 3)")
+    parser.add_argument("--budget-s", type=float, default=2.0, help="Stop repeating a case after this much time")
+    parser.add_argument("--concurrency", type=int, default=8, help="In-flight requests for the api component")
+    parser.add_argument("--llm-ms", type=float, default=0.0, help="Simulated LLM latency for /agent/advise")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write results to this file")
+    parser.add_argument("--compare", default=None, help="Baseline JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown/memory growth vs baseline")
+    args = parser.parse_args()
+
+    components = [c.strip() for c in args.components.split(",") if c.strip()]
+    unknown = set(components) - set(COMPONENTS)
+    if unknown:
+        parser.error(f"Unknown components: {', '.join(sorted(unknown))}")
+    sizes = SIZES["quick" if args.quick else "full"]
+
+    results: List[Dict] = []
+    for component in components:
+        if component == "api":
+            results.extend(bench_api(sizes, args.concurrency, args.llm_ms))
+        else:
+            bench = {"parser": bench_parser, "storage": bench_storage, "optimizer": bench_optimizer}[component]
+            results.extend(bench(sizes, args.repeat, args.budget_s))
+    print_table(results)
+
+    report = {
+        "meta": {
+            "created_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    regressions = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline["results"], args.tolerance)
+        regressions = sum(r["regression"] for r in rows)
+        print()
+        print_comparison(rows)
+        print(f"\n{regressions} regression(s) beyond {args.tolerance:.0%} against {args.compare}")
+        report["comparison"] = {"baseline": args.compare, "tolerance": args.tolerance, "rows": rows}
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+    # Non-zero exit so CI can gate on regressions
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
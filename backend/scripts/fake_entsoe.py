@@ -0,0 +1,311 @@
+"""
+Local stand-in for the ENTSO-E transparency platform.
+
+Serves valid A44 (day-ahead prices), A65 (actual total load) and A75
+(generation per production type) XML documents so the live code path of
+EntsoeClient - HTTP, parsing, filtering - can be exercised and load-tested
+without touching the real API.
+
+Usage:
+    python -m scripts.fake_entsoe --port 8081 --resolution PT15M --latency-ms 50 --rate-429 0.02
+
+Then point the backend at it:
+    ENTSOE_BASE_URL=http://127.0.0.1:8081/api ENTSOE_API_TOKEN=fake USE_MOCK_DATA=false
+"""
+import argparse
+import asyncio
+import math
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from pydantic import BaseModel, Field
+
+from app.services.synthetic_market import SyntheticMarket
+
+DEFAULT_ZONES = [
+    "10YNL----------L",  # NL
+    "10YBE----------2",  # BE
+    "10Y1001A1001A82H",  # DE-LU
+    "10YFR-RTE------C",  # FR
+]
+
+STEP_MINUTES = {"PT15M": 15, "PT30M": 30, "PT60M": 60}
+
+
+class FakeEntsoeConfig(BaseModel):
+    zones: List[str] = Field(default_factory=lambda: list(DEFAULT_ZONES))
+    resolution: str = Field(default="PT60M", description="PT15M, PT30M or PT60M")
+    pad_days: int = Field(default=0, ge=0, description="Extra days served after the requested window")
+    latency_ms: float = Field(default=0.0, ge=0)
+    jitter_ms: float = Field(default=0.0, ge=0)
+    rate_429: float = Field(default=0.0, ge=0, le=1)
+    rate_5xx: float = Field(default=0.0, ge=0, le=1)
+    retry_after_s: int = Field(default=1, ge=0)
+    seed: int = 42
+
+
+# ---------- synthetic curves ----------
+def _intraday_shape(ts: datetime) -> float:
+    """Double-peaked daily profile around 1.0 (morning and evening peaks)"""
+    h = ts.hour + ts.minute / 60
+    return (
+        0.8
+        + 0.35 * math.exp(-((h - 8) ** 2) / 6)
+        + 0.45 * math.exp(-((h - 19) ** 2) / 5)
+    )
+
+
+def _slot_rng(seed: int, zone_eic: str, ts: datetime) -> random.Random:
+    return random.Random(f"{seed}:{zone_eic}:{ts.isoformat()}")
+
+
+def _price(seed: int, zone_eic: str, ts: datetime) -> float:
+    rng = _slot_rng(seed, zone_eic, ts)
+    return round(80 * _intraday_shape(ts) * (1 + rng.uniform(-0.1, 0.1)), 2)
+
+
+def _load(seed: int, zone_eic: str, ts: datetime) -> float:
+    rng = _slot_rng(seed + 1, zone_eic, ts)
+    return round(12000 * _intraday_shape(ts) * (1 + rng.uniform(-0.03, 0.03)), 1)
+
+
+# ---------- XML rendering ----------
+def _fmt(ts: datetime) -> str:
+    return ts.strftime("%Y-%m-%dT%H:%MZ")
+
+
+def _periods(start: datetime, end: datetime):
+    """Split [start, end) into day-long periods, the way the platform publishes them"""
+    cursor = start
+    while cursor < end:
+        nxt = min(cursor + timedelta(days=1), end)
+        yield cursor, nxt
+        cursor = nxt
+
+
+def _points(start: datetime, end: datetime, step: timedelta, value_fn, tag: str) -> str:
+    parts = []
+    position = 1
+    ts = start
+    while ts < end:
+        parts.append(f"<Point><position>{position}</position><{tag}>{value_fn(ts)}</{tag}></Point>")
+        position += 1
+        ts += step
+    return "".join(parts)
+
+
+def render_prices(config: FakeEntsoeConfig, zone_eic: str, start: datetime, end: datetime) -> str:
+    step = timedelta(minutes=STEP_MINUTES[config.resolution])
+    series = []
+    for i, (p_start, p_end) in enumerate(_periods(start, end), start=1):
+        points = _points(p_start, p_end, step, lambda ts: _price(config.seed, zone_eic, ts), "price.amount")
+        series.append(
+            f"<TimeSeries><mRID>{i}</mRID><businessType>A62</businessType>"
+            f'<in_Domain.mRID codingScheme="A01">{zone_eic}</in_Domain.mRID>'
+            f'<out_Domain.mRID codingScheme="A01">{zone_eic}</out_Domain.mRID>'
+            f"<currency_Unit.name>EUR</currency_Unit.name>"
+            f"<price_Measure_Unit.name>MWH</price_Measure_Unit.name><curveType>A01</curveType>"
+            f"<Period><timeInterval><start>{_fmt(p_start)}</start><end>{_fmt(p_end)}</end></timeInterval>"
+            f"<resolution>{config.resolution}</resolution>{points}</Period></TimeSeries>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<Publication_MarketDocument xmlns="urn:iec62325.351:tc57wg16:451-3:publicationdocument:7:3">'
+        f"<mRID>{uuid.uuid4().hex}</mRID><revisionNumber>1</revisionNumber><type>A44</type>"
+        f"<createdDateTime>{datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}</createdDateTime>"
+        f"<period.timeInterval><start>{_fmt(start)}</start><end>{_fmt(end)}</end></period.timeInterval>"
+        f"{''.join(series)}</Publication_MarketDocument>"
+    )
+
+
+def render_load(config: FakeEntsoeConfig, zone_eic: str, start: datetime, end: datetime) -> str:
+    step = timedelta(minutes=STEP_MINUTES[config.resolution])
+    series = []
+    for i, (p_start, p_end) in enumerate(_periods(start, end), start=1):
+        points = _points(p_start, p_end, step, lambda ts: _load(config.seed, zone_eic, ts), "quantity")
+        series.append(
+            f"<TimeSeries><mRID>{i}</mRID><businessType>A04</businessType>"
+            f"<objectAggregation>A01</objectAggregation>"
+            f'<outBiddingZone_Domain.mRID codingScheme="A01">{zone_eic}</outBiddingZone_Domain.mRID>'
+            f"<quantity_Measure_Unit.name>MAW</quantity_Measure_Unit.name><curveType>A01</curveType>"
+            f"<Period><timeInterval><start>{_fmt(p_start)}</start><end>{_fmt(p_end)}</end></timeInterval>"
+            f"<resolution>{config.resolution}</resolution>{points}</Period></TimeSeries>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<GL_MarketDocument xmlns="urn:iec62325.351:tc57wg16:451-6:generationloaddocument:3:0">'
+        f"<mRID>{uuid.uuid4().hex}</mRID><revisionNumber>1</revisionNumber><type>A65</type>"
+        f"<process.processType>A16</process.processType>"
+        f"<createdDateTime>{datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}</createdDateTime>"
+        f"<time_Period.timeInterval><start>{_fmt(start)}</start><end>{_fmt(end)}</end></time_Period.timeInterval>"
+        f"{''.join(series)}</GL_MarketDocument>"
+    )
+
+
+def render_generation(config: FakeEntsoeConfig, zone_eic: str, start: datetime, end: datetime) -> str:
+    market = SyntheticMarket(seed=config.seed, resolution_minutes=STEP_MINUTES[config.resolution])
+    first_day = start.replace(hour=0, minute=0)
+    days = (end - first_day).days + 1
+    mix = market.generation(zone_eic, first_day, days)
+    step = timedelta(minutes=STEP_MINUTES[config.resolution])
+
+    series = []
+    for psr_type, values in mix.items():
+        flat = values.ravel()
+        for p_start, p_end in _periods(start, end):
+            offset = int((p_start - first_day) / step)
+            points = "".join(
+                f"<Point><position>{i + 1}</position><quantity>{flat[offset + i]}</quantity></Point>"
+                for i in range(int((p_end - p_start) / step))
+            )
+            series.append(
+                f"<TimeSeries><mRID>{len(series) + 1}</mRID><businessType>A01</businessType>"
+                f"<objectAggregation>A08</objectAggregation>"
+                f'<inBiddingZone_Domain.mRID codingScheme="A01">{zone_eic}</inBiddingZone_Domain.mRID>'
+                f"<quantity_Measure_Unit.name>MAW</quantity_Measure_Unit.name><curveType>A01</curveType>"
+                f"<MktPSRType><psrType>{psr_type}</psrType></MktPSRType>"
+                f"<Period><timeInterval><start>{_fmt(p_start)}</start><end>{_fmt(p_end)}</end></timeInterval>"
+                f"<resolution>{config.resolution}</resolution>{points}</Period></TimeSeries>"
+            )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<GL_MarketDocument xmlns="urn:iec62325.351:tc57wg16:451-6:generationloaddocument:3:0">'
+        f"<mRID>{uuid.uuid4().hex}</mRID><revisionNumber>1</revisionNumber><type>A75</type>"
+        f"<process.processType>A16</process.processType>"
+        f"<createdDateTime>{datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}</createdDateTime>"
+        f"<time_Period.timeInterval><start>{_fmt(start)}</start><end>{_fmt(end)}</end></time_Period.timeInterval>"
+        f"{''.join(series)}</GL_MarketDocument>"
+    )
+
+
+def render_acknowledgement(reason: str, code: str = "999") -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<Acknowledgement_MarketDocument xmlns="urn:iec62325.351:tc57wg16:451-1:acknowledgementdocument:7:0">'
+        f"<mRID>{uuid.uuid4().hex}</mRID>"
+        f"<Reason><code>{code}</code><text>{reason}</text></Reason>"
+        "</Acknowledgement_MarketDocument>"
+    )
+
+
+# ---------- app ----------
+def _parse_period(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y%m%d%H%M").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def create_app(config: Optional[FakeEntsoeConfig] = None) -> FastAPI:
+    config = config or FakeEntsoeConfig()
+    if config.resolution not in STEP_MINUTES:
+        raise ValueError(f"Unsupported resolution {config.resolution}")
+
+    app = FastAPI(title="Fake ENTSO-E transparency platform")
+    app.state.config = config
+    app.state.rng = random.Random(config.seed)
+    app.state.stats = {"requests": 0, "served": 0, "429": 0, "5xx": 0}
+
+    def xml(body: str, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+        return Response(content=body, status_code=status_code, media_type="application/xml", headers=headers)
+
+    @app.get("/api")
+    async def transparency_api(request: Request):
+        params = request.query_params
+        stats = app.state.stats
+        stats["requests"] += 1
+
+        delay = config.latency_ms + app.state.rng.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        roll = app.state.rng.random()
+        if roll < config.rate_429:
+            stats["429"] += 1
+            return xml(
+                render_acknowledgement("Too many requests", code="429"),
+                status_code=429,
+                headers={"Retry-After": str(config.retry_after_s)},
+            )
+        if roll < config.rate_429 + config.rate_5xx:
+            stats["5xx"] += 1
+            return xml(
+                render_acknowledgement("Service temporarily unavailable", code="503"),
+                status_code=app.state.rng.choice([500, 502, 503]),
+            )
+
+        if not params.get("securityToken"):
+            return xml(render_acknowledgement("Unauthorized. Missing or invalid security token", "401"), 401)
+
+        start = _parse_period(params.get("periodStart"))
+        end = _parse_period(params.get("periodEnd"))
+        if not start or not end or end <= start:
+            return xml(render_acknowledgement("Invalid periodStart/periodEnd", "999"), 400)
+        end += timedelta(days=config.pad_days)
+
+        document_type = params.get("documentType")
+        if document_type == "A44":
+            zone_eic = params.get("in_Domain")
+            renderer = render_prices
+        elif document_type == "A65":
+            zone_eic = params.get("outBiddingZone_Domain")
+            renderer = render_load
+        elif document_type == "A75":
+            zone_eic = params.get("in_Domain")
+            renderer = render_generation
+        else:
+            return xml(render_acknowledgement(f"Unsupported documentType {document_type}"), 400)
+
+        if zone_eic not in config.zones:
+            return xml(render_acknowledgement("No matching data found for Data item"))
+
+        stats["served"] += 1
+        return xml(renderer(config, zone_eic, start, end))
+
+    @app.get("/stats")
+    async def get_stats():
+        return app.state.stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local ENTSO-E stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--zones", default=",".join(DEFAULT_ZONES), help="Comma-separated EIC codes")
+    parser.add_argument("--resolution", default="PT60M", choices=sorted(STEP_MINUTES))
+    parser.add_argument("--pad-days", type=int, default=0, help="Serve extra days to inflate documents")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--retry-after-s", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    config = FakeEntsoeConfig(
+        zones=[z.strip() for z in args.zones.split(",") if z.strip()],
+        resolution=args.resolution,
+        pad_days=args.pad_days,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        retry_after_s=args.retry_after_s,
+        seed=args.seed,
+    )
+
+    import uvicorn
+
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Fixed-concurrency load test for the optimizer API.
+
+Drives /ingest/entsoe, /optimize/load-shift and /agent/advise with a fixed
+number of concurrent workers and reports throughput and p50/p95/p99 latency
+per endpoint. Pair it with scripts.fake_entsoe to exercise the live
+ENTSO-E code path.
+
+Usage:
+    python -m scripts.loadtest --base-url http://127.0.0.1:8000 --concurrency 32 --requests 500
+    python -m scripts.loadtest --endpoints optimize --duration 30 --json results.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+ENDPOINTS: Dict[str, Callable[[str, str, int], tuple]] = {
+    "ingest": lambda zone, day, i: ("/ingest/entsoe", {"zone_eic": zone, "date_utc": day}),
+    "optimize": lambda zone, day, i: (
+        "/optimize/load-shift",
+        {"zone_eic": zone, "date_utc": day, "kwh_flexible": 6.0, "max_shift_hours": 3},
+    ),
+    "advise": lambda zone, day, i: (
+        "/agent/advise",
+        {"user_id": f"loadtest-{i % 100}", "zone_eic": zone, "date_utc": day, "kwh_flexible": 6.0},
+    ),
+}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class EndpointStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.started = 0.0
+        self.finished = 0.0
+
+    def record(self, latency_s: float, status: str):
+        self.latencies.append(latency_s)
+        self.statuses[status] += 1
+
+    def summary(self) -> Dict:
+        lat = sorted(self.latencies)
+        elapsed = max(self.finished - self.started, 1e-9)
+        ok = sum(n for s, n in self.statuses.items() if s.startswith("2"))
+        return {
+            "endpoint": self.name,
+            "requests": len(lat),
+            "ok": ok,
+            "errors": len(lat) - ok,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(lat) / elapsed, 1),
+            "p50_ms": round(percentile(lat, 50) * 1000, 2),
+            "p95_ms": round(percentile(lat, 95) * 1000, 2),
+            "p99_ms": round(percentile(lat, 99) * 1000, 2),
+            "max_ms": round((lat[-1] if lat else 0) * 1000, 2),
+            "statuses": dict(self.statuses),
+        }
+
+
+async def run_endpoint(
+        client: httpx.AsyncClient,
+        name: str,
+        zones: List[str],
+        days: List[str],
+        concurrency: int,
+        total: Optional[int],
+        duration: Optional[float],
+) -> EndpointStats:
+    stats = EndpointStats(name)
+    build = ENDPOINTS[name]
+    counter = itertools.count()
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker():
+        while True:
+            i = next(counter)
+            if total is not None and i >= total:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            path, payload = build(zones[i % len(zones)], days[(i // len(zones)) % len(days)], i)
+            t0 = time.perf_counter()
+            try:
+                resp = await client.post(path, json=payload)
+                status = str(resp.status_code)
+                # A 200 ingest that stored no prices means ENTSO-E could not be reached
+                if name == "ingest" and resp.status_code == 200 and not resp.json().get("has_prices"):
+                    status = "no_data"
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            stats.record(time.perf_counter() - t0, status)
+
+    stats.started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    stats.finished = time.perf_counter()
+    return stats
+
+
+async def run(args) -> List[Dict]:
+    zones = [z.strip() for z in args.zones.split(",") if z.strip()]
+    start = date.fromisoformat(args.start_date)
+    days = [(start + timedelta(days=d)).isoformat() for d in range(args.days)]
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    total = None if args.duration else args.requests
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        if args.warmup:
+            # Populate storage so the first measured requests are not all cold fetches
+            for zone, day in itertools.product(zones, days):
+                await client.post("/ingest/entsoe", json={"zone_eic": zone, "date_utc": day})
+
+        results = []
+        for name in endpoints:
+            stats = await run_endpoint(client, name, zones, days, args.concurrency, total, args.duration)
+            results.append(stats.summary())
+        return results
+
+
+def print_table(results: List[Dict]):
+    header = f"{'endpoint':<10}{'reqs':>8}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['endpoint']:<10}{r['requests']:>8}{r['errors']:>8}{r['throughput_rps']:>10}"
+            f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the optimizer API at fixed concurrency")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoints", default="ingest,optimize,advise", help=f"Any of {','.join(ENDPOINTS)}")
+    parser.add_argument("--zones", default="10YNL----------L")
+    parser.add_argument("--start-date", default=date.today().isoformat())
+    parser.add_argument("--days", type=int, default=1, help="Number of consecutive dates to cycle through")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--duration", type=float, default=None, help="Seconds per endpoint (overrides --requests)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--no-warmup", dest="warmup", action="store_false")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    unknown = set(args.endpoints.split(",")) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"concurrency": args.concurrency, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+import numpy as np
+import pytest
+from app.db.storage import DataStorage
+from app.models.backtest import BacktestRequest
+from app.services import backtest
+from app.services.backtest import date_range, run_backtest, strategy_costs
+from app.services.optimizer import LoadOptimizer
+from app.services.synthetic_market import SyntheticMarket
+
+ZONE = "10YNL----------L"
+START = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def test_cheapest_n_matches_load_optimizer_at_15_minutes():
+    records = SyntheticMarket(seed=3, resolution_minutes=15).price_records(ZONE, START)
+    optimizer = LoadOptimizer()
+    optimizer.set_price_data(ZONE, "2024-03-01", records)
+    result = optimizer.optimize(ZONE, "2024-03-01", 6.0, 3)
+
+    # 3 hours at PT15M is 12 slots in both paths
+    assert len(result['schedule']) == 12
+    prices = np.array([[p['price_eur_kwh'] for p in records]])
+    baseline, optimized = strategy_costs(prices, {"kwh_flexible": 6.0, "max_shift_hours": 3}, 0.25)
+    assert optimized[0] == pytest.approx(result['optimized_cost_eur'], abs=0.005)
+    assert baseline[0] == pytest.approx(result['baseline_cost_eur'], abs=0.005)
+
+
+def test_price_matrix_resamples_across_resolution_switch():
+    store = DataStorage()
+    hourly = SyntheticMarket(seed=3, resolution_minutes=60)
+    quarter = SyntheticMarket(seed=3, resolution_minutes=15)
+    dates = date_range("2024-03-01", "2024-03-05")
+    for d in dates[:2]:
+        store.save_prices(ZONE, d, hourly.price_records(ZONE, datetime.strptime(d, "%Y-%m-%d")))
+    for d in dates[2:4]:
+        store.save_prices(ZONE, d, quarter.price_records(ZONE, datetime.strptime(d, "%Y-%m-%d")))
+    # A partial day is the only one left out
+    store.save_prices(ZONE, dates[4], quarter.price_records(ZONE, datetime.strptime(dates[4], "%Y-%m-%d"))[:40])
+
+    kept, matrix = store.get_price_matrix(ZONE, dates)
+    assert kept == dates[:4]
+    assert matrix.shape == (4, 96)
+    first = np.array([p['price_eur_kwh'] for p in store.get_prices(ZONE, dates[0])])
+    np.testing.assert_array_equal(matrix[0], np.repeat(first, 4))
+
+
+def test_parallel_sweep_matches_serial(monkeypatch):
+    dates = date_range("2023-01-01", "2023-03-31")
+    prices = SyntheticMarket(seed=5, resolution_minutes=15).prices(ZONE, START, len(dates)) / 1000
+    params = [{"strategy": s, "kwh_flexible": 6.0, "max_shift_hours": h} for s in ("cheapest_n", "contiguous")
+              for h in (1, 3, 6)]
+    serial = run_backtest(dates, prices, params, workers=1)
+    monkeypatch.setattr(backtest, "PARALLEL_MIN_CELLS", 0)
+    assert run_backtest(dates, prices, params, workers=3) == serial
+
+
+def test_request_range_is_capped():
+    BacktestRequest(start_date="2015-01-01", end_date="2024-12-31", source="synthetic")
+    with pytest.raises(ValueError, match="must not exceed"):
+        BacktestRequest(start_date="0001-01-01", end_date="9999-12-31", source="synthetic")
+    with pytest.raises(ValueError, match="before start_date"):
+        BacktestRequest(start_date="2024-02-01", end_date="2024-01-01")
@@ -0,0 +1,120 @@
+import itertools
+from datetime import datetime
+import numpy as np
+import pytest
+from app.models.optimization import StorageBatchRequest
+from app.services import battery_optimizer
+from app.services.battery_optimizer import BatteryOptimizer
+from app.services.synthetic_market import SyntheticMarket
+
+ZONE = "10YNL----------L"
+
+
+def _site(**overrides):
+    site = dict(
+        capacity_kwh=13.5, max_charge_kw=5.0, max_discharge_kw=5.0,
+        round_trip_efficiency=0.9, initial_soc_kwh=0.0, final_soc_kwh=None
+    )
+    site.update(overrides)
+    return site
+
+
+def _ev_prices():
+    return SyntheticMarket(seed=1, resolution_minutes=15).price_records(ZONE, datetime(2024, 6, 1))
+
+
+def test_unreachable_target_raises():
+    prices = np.full((1, 4), 0.1)  # four 6-hour slots
+    site = _site(capacity_kwh=100.0, max_charge_kw=1.0, final_soc_kwh=90.0)
+    with pytest.raises(ValueError, match="unreachable"):
+        BatteryOptimizer().optimize_batch(prices, [site])
+
+
+@pytest.mark.parametrize("soc_levels", [51, 101])
+def test_ev_charger_power_is_not_floored_to_the_grid(soc_levels):
+    # 75 kWh EV on a 3.7 kW charger: 0.925 kWh per 15-minute slot from the grid
+    site = _site(capacity_kwh=75.0, max_charge_kw=3.7, max_discharge_kw=3.7,
+                 initial_soc_kwh=20.0, final_soc_kwh=60.0)
+    result = BatteryOptimizer(soc_levels).optimize(_ev_prices(), site)
+    charge = [s['charge_kwh'] for s in result['schedule']]
+    assert max(charge) == pytest.approx(0.925, abs=1e-3)
+    assert result['schedule'][-1]['soc_kwh'] == pytest.approx(60.0, abs=75.0 / (soc_levels - 1))
+    # Baseline is charging straight away, which the optimizer must not beat by losing energy
+    assert result['baseline_cost_eur'] > result['optimized_cost_eur']
+    assert result['savings_percent'] is not None
+
+
+def test_single_and_batch_defaults_agree():
+    assert StorageBatchRequest.model_fields['soc_levels'].default == BatteryOptimizer().soc_levels
+
+
+def test_arbitrage_has_no_percent():
+    result = BatteryOptimizer().optimize(_ev_prices(), _site())
+    assert result['baseline_cost_eur'] == 0
+    assert result['savings_percent'] is None
+
+
+def _brute_force(prices: np.ndarray, arrays, i: int) -> float:
+    """Cheapest feasible move sequence on the optimizer's own grid, by enumeration"""
+    d_e, eta_c, eta_d = arrays['d_e'][i], arrays['eta_c'][i], arrays['eta_d'][i]
+    moves = range(-int(arrays['down'][i]), int(arrays['up'][i]) + 1)
+    best = np.inf
+    for path in itertools.product(moves, repeat=len(prices)):
+        level, cost = int(arrays['start'][i]), 0.0
+        for price, move in zip(prices, path):
+            level += move
+            if level < 0 or level > arrays['top'][i]:
+                break
+            stored = move * d_e
+            cost += price * (stored / eta_c if stored > 0 else stored * eta_d)
+        else:
+            if level == arrays['end'][i]:
+                best = min(best, cost)
+    return best
+
+
+def test_dp_matches_brute_force():
+    rng = np.random.default_rng(7)
+    optimizer = BatteryOptimizer(soc_levels=5)
+    sites = [
+        _site(capacity_kwh=4.0, max_charge_kw=0.25, max_discharge_kw=0.25, initial_soc_kwh=1.0),
+        _site(capacity_kwh=4.0, max_charge_kw=0.5, max_discharge_kw=0.2, initial_soc_kwh=0.0, final_soc_kwh=3.0),
+        _site(capacity_kwh=4.0, max_charge_kw=0.3, max_discharge_kw=0.6, round_trip_efficiency=0.8,
+              initial_soc_kwh=4.0, final_soc_kwh=2.0),
+    ]
+    for _ in range(5):
+        prices = rng.uniform(-0.05, 0.3, size=(len(sites), 6))  # 4-hour slots
+        solved = optimizer.optimize_batch(prices, sites)
+        arrays = optimizer._site_arrays(sites, 4.0)
+        for i in range(len(sites)):
+            assert solved['cost_eur'][i] == pytest.approx(_brute_force(prices[i], arrays, i), abs=1e-12)
+            realized = (prices[i] * (solved['charge_kwh'][i] - solved['discharge_kwh'][i])).sum()
+            assert realized == pytest.approx(solved['cost_eur'][i], abs=1e-12)
+
+
+def test_chunked_batch_matches_single_pass(monkeypatch):
+    records = _ev_prices()
+    prices = np.array([[p['price_eur_kwh'] for p in records]] * 6)
+    sites = [_site(capacity_kwh=c, initial_soc_kwh=c / 2) for c in (5.0, 13.5, 20.0, 7.0, 13.5, 40.0)]
+    whole = BatteryOptimizer().optimize_batch(prices, sites)
+    monkeypatch.setattr(battery_optimizer, "MAX_POLICY_BYTES", 1)  # one site per chunk
+    chunked = BatteryOptimizer().optimize_batch(prices, sites)
+    np.testing.assert_allclose(chunked['cost_eur'], whole['cost_eur'])
+    np.testing.assert_allclose(chunked['soc_kwh'], whole['soc_kwh'])
+
+
+def test_batch_request_size_is_capped():
+    site = dict(_site(), date_utc="2024-06-01")
+    with pytest.raises(ValueError, match="DP cells"):
+        StorageBatchRequest(sites=[site] * 10000, soc_levels=1001)
+
+
+def test_batch_cap_counts_power_steps():
+    # Same sites x soc_levels; a charger fast relative to capacity needs many more moves
+    slow = dict(_site(), date_utc="2024-06-01")
+    fast = dict(_site(max_charge_kw=11.0, max_discharge_kw=11.0), date_utc="2024-06-01")
+    solver = BatteryOptimizer()
+    assert solver.dp_cells([fast], 96) > 2 * solver.dp_cells([slow], 96)
+    StorageBatchRequest(sites=[slow] * 2000)
+    with pytest.raises(ValueError, match="DP cells"):
+        StorageBatchRequest(sites=[fast] * 10000)
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+import numpy as np
+from app.db.storage import DataStorage
+from app.services.forecaster import MIN_RIDGE_DAYS, N_FEATURES, PriceForecaster, _shift
+from app.services.synthetic_market import SyntheticMarket
+
+ZONE = "10YNL----------L"
+START = datetime(2024, 1, 1)
+
+
+def _dates(n):
+    return [(START + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(n)]
+
+
+def _setup():
+    store = DataStorage()
+    forecaster = PriceForecaster(store, alpha=10.0)
+    store.subscribe(forecaster.on_storage_update)
+    return store, forecaster
+
+
+def test_incremental_replacement_matches_batch_fit():
+    market = SyntheticMarket(seed=11, resolution_minutes=60)
+    dates = _dates(21)
+    store, forecaster = _setup()
+
+    # Out of order, then re-ingest a few days with revised prices
+    for i in np.random.default_rng(0).permutation(len(dates)):
+        store.save_prices(ZONE, dates[i], market.price_records(ZONE, START + timedelta(days=int(i))))
+    for i in (3, 9, 15):
+        revised = [{**p, 'price_eur_mwh': p['price_eur_mwh'] * 1.3} for p in store.get_prices(ZONE, dates[i])]
+        store.save_prices(ZONE, dates[i], revised)
+
+    model = forecaster.zones[ZONE]
+    trained = sorted(model.days)
+    assert len(trained) >= MIN_RIDGE_DAYS
+
+    # Batch fit over the final stored history, one stacked design matrix
+    xs, ys = [], []
+    for d in trained:
+        actual = forecaster._stored_prices(ZONE, d)
+        x = forecaster._features(ZONE, d, forecaster._stored_prices(ZONE, _shift(d, -1)),
+                                 forecaster._stored_prices(ZONE, _shift(d, -7)))
+        xs.append(x)
+        ys.append(actual)
+    x, y = np.vstack(xs), np.concatenate(ys)
+    penalty = 10.0 * np.eye(N_FEATURES)
+    penalty[0, 0] = 0.0
+    batch = np.linalg.solve(x.T @ x + penalty, x.T @ y)
+
+    np.testing.assert_allclose(model.xtx, x.T @ x, rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(model.weights(10.0), batch, rtol=1e-7, atol=1e-9)
+
+
+def test_cache_dropped_on_new_save():
+    market = SyntheticMarket(seed=11, resolution_minutes=60)
+    dates = _dates(10)
+    store, forecaster = _setup()
+    for i, d in enumerate(dates[:-1]):
+        store.save_prices(ZONE, d, market.price_records(ZONE, START + timedelta(days=i)))
+
+    target = dates[-1]
+    first = forecaster.forecast(ZONE, target)
+    assert first is not None and forecaster.forecast(ZONE, target) is first
+
+    # Revised history for the day before: the cached curve must not be served
+    revised = [{**p, 'price_eur_mwh': p['price_eur_mwh'] + 50} for p in store.get_prices(ZONE, dates[-2])]
+    store.save_prices(ZONE, dates[-2], revised)
+    assert all(key[0] != ZONE for key in forecaster._cache)
+    second = forecaster.forecast(ZONE, target)
+    assert second is not first
+    assert second['prices'] != first['prices']
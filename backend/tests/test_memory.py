@@ -0,0 +1,53 @@
+import asyncio
+import threading
+from app.db.memory import MemoryStore
+from scripts.bench_advise import HashEmbedding
+
+
+def _store(tmp_path, cache_size=4):
+    return MemoryStore(path=str(tmp_path), cache_size=cache_size, embedding_function=HashEmbedding())
+
+
+def test_cache_stays_bounded_and_runs_are_not_preferences(tmp_path):
+    async def scenario():
+        store = _store(tmp_path)
+        for i in range(20):
+            await store.save_preference(f"u{i}", "ev: charge before 07:00")
+            await store.save_optimization_run(f"u{i}", {"savings_eur": 1.0, "kwh_flexible": 6.0})
+            assert await store.get_user_preferences(f"u{i}") == ["ev: charge before 07:00"]
+        assert len(store._prefs_cache) == 4
+        assert not store._versions and not store._reading
+
+        await store.get_user_preferences("u19")
+        assert store.cache_hits == 1
+        await store.save_preference("u19", "heat pump: off at peak")
+        assert sorted(await store.get_user_preferences("u19")) == ["ev: charge before 07:00", "heat pump: off at peak"]
+
+    asyncio.run(scenario())
+
+
+def test_read_in_flight_during_save_is_not_cached(tmp_path):
+    async def scenario():
+        store = _store(tmp_path)
+        await store.save_preference("u", "old")
+        release = threading.Event()
+        original = store.collection.get
+
+        def slow_get(**kwargs):
+            result = original(**kwargs)  # snapshot taken before the save below
+            release.wait(5)
+            return result
+
+        store.collection.get = slow_get
+        read = asyncio.create_task(store.get_user_preferences("u"))
+        await asyncio.sleep(0.05)
+        store.collection.get = original
+        await store.save_preference("u", "new")
+        release.set()
+
+        assert await read == ["old"]
+        assert "u" not in store._prefs_cache
+        assert sorted(await store.get_user_preferences("u")) == ["new", "old"]
+        assert not store._versions and not store._reading
+
+    asyncio.run(scenario())
@@ -0,0 +1,35 @@
+import asyncio
+from datetime import datetime
+import httpx
+import pytest
+from app.db.storage import storage
+from app.main import app
+from app.services.synthetic_market import SyntheticMarket
+
+ZONE = "10YNL----------L"
+DAY = "2031-05-04"
+
+
+@pytest.mark.parametrize("resolution", [60, 15])
+def test_single_zone_day_matches_load_shift(resolution):
+    zone = f"{ZONE}-{resolution}"
+    records = SyntheticMarket(seed=9, resolution_minutes=resolution).price_records(zone, datetime(2031, 5, 4))
+    storage.save_prices(zone, DAY, records)
+
+    async def call():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            single = await client.post("/optimize/load-shift", json={
+                "zone_eic": zone, "date_utc": DAY, "kwh_flexible": 6.0, "max_shift_hours": 3
+            })
+            multi = await client.post("/optimize/multi-zone", json={
+                "zones": [zone], "date_utc": DAY, "kwh_flexible": 6.0, "max_shift_hours": 3
+            })
+            return single.json(), multi.json()
+
+    single, multi = asyncio.run(call())
+
+    compared = multi['zones'][0]
+    assert len(compared['schedule']) == len(single['schedule']) == 3 * 60 // resolution
+    for key in ("baseline_cost_eur", "optimized_cost_eur", "savings_eur"):
+        assert compared[key] == single[key]
+    assert sorted(s['hour_utc'] for s in compared['schedule']) == sorted(s['hour_utc'] for s in single['schedule'])
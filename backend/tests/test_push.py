@@ -0,0 +1,31 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.api import subscribe as subscribe_api
+from app.db.storage import DataStorage
+from app.services.push import ScheduleBroadcaster
+
+ZONE = "10YNL----------L"
+
+
+def test_over_limit_subscriber_gets_503_before_streaming(monkeypatch):
+    broadcaster = ScheduleBroadcaster(DataStorage(), max_subscribers=2)
+    monkeypatch.setattr(subscribe_api, "broadcaster", broadcaster)
+
+    async def scenario():
+        opened = [await subscribe_api.subscribe_schedules(zone_eic=ZONE, kwh_flexible=6.0) for _ in range(2)]
+        with pytest.raises(HTTPException) as exc:
+            await subscribe_api.subscribe_schedules(zone_eic=ZONE, kwh_flexible=6.0)
+        assert exc.value.status_code == 503
+
+        # Closing a stream gives its slot back
+        stream = opened[0].body_iterator
+        assert (await stream.__anext__()).startswith(b"event: subscribed")
+        await stream.aclose()
+        assert broadcaster.count == 1
+
+        # So does the response's background task, for a stream never read
+        await opened[1].background()
+        assert broadcaster.count == 0
+
+    asyncio.run(scenario())